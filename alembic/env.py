@@ -0,0 +1,57 @@
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import context
+from src.core.settings import settings
+from src.db.models import Base
+
+config = context.config
+
+# При запуске из приложения (src.db.utils.ensure_schema) логирование уже настроено
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Генерирует SQL миграций без подключения к БД (alembic upgrade --sql)."""
+    context.configure(
+        url=str(settings.database_url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """Применяет миграции через асинхронный движок приложения."""
+    connectable = create_async_engine(str(settings.database_url), poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+elif "connection" in config.attributes:
+    # Приложение передает свое соединение: миграции идут в его транзакции
+    do_run_migrations(config.attributes["connection"])
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,119 @@
+"""Исходная схема (в том виде, в каком ее создавал Base.metadata.create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("telegram_id", sa.BigInteger(), nullable=False),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("timezone", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_users_telegram_id", "users", ["telegram_id"], unique=True)
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+
+    op.create_table(
+        "phases",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("monthly_target", sa.Numeric(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.UniqueConstraint("name"),
+    )
+
+    op.create_table(
+        "envelopes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("balance", sa.Numeric(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_savings", sa.Boolean(), nullable=False),
+    )
+
+    op.create_table(
+        "goals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("target_amount", sa.Numeric(), nullable=False),
+        sa.Column("linked_envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("phase_id", sa.Integer(), sa.ForeignKey("phases.id"), nullable=False),
+    )
+
+    op.create_table(
+        "system_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("current_phase_id", sa.Integer(), sa.ForeignKey("phases.id"), nullable=True),
+    )
+
+    op.create_table(
+        "scheduled_tasks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("phase_id", sa.Integer(), sa.ForeignKey("phases.id"), nullable=False),
+        sa.Column("task_type", sa.String(), nullable=False),
+        sa.Column("cron_day", sa.String(), nullable=False),
+        sa.Column("cron_hour", sa.Integer(), nullable=False),
+        sa.Column("reminder_text", sa.String(), nullable=True),
+        sa.Column("amount", sa.Numeric(), nullable=True),
+        sa.Column("from_envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=True),
+        sa.Column("to_envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=False),
+        sa.Column("envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=False),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column("transaction_date", sa.Date(), nullable=False),
+        sa.Column("comment", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+    op.create_table(
+        "transfers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("from_envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=False),
+        sa.Column("to_envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=False),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column("transfer_date", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transfers")
+    op.drop_table("transactions")
+    op.drop_table("scheduled_tasks")
+    op.drop_table("system_state")
+    op.drop_table("goals")
+    op.drop_table("envelopes")
+    op.drop_table("phases")
+    op.drop_table("categories")
+    op.drop_index("ix_users_telegram_id", table_name="users")
+    op.drop_table("users")
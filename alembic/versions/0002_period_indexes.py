@@ -0,0 +1,35 @@
+"""Составные индексы для выборок transactions и transfers за период
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя индекса, таблица, колонки). if_not_exists: на базе, созданной через create_all
+# уже после добавления индексов в модели, они могут существовать.
+INDEXES = [
+    ("ix_transactions_envelope_id_transaction_date", "transactions", ["envelope_id", "transaction_date"]),
+    ("ix_transactions_user_id_transaction_date", "transactions", ["user_id", "transaction_date"]),
+    ("ix_transactions_category_id", "transactions", ["category_id"]),
+    ("ix_transfers_to_envelope_id_transfer_date", "transfers", ["to_envelope_id", "transfer_date"]),
+    ("ix_transfers_from_envelope_id_transfer_date", "transfers", ["from_envelope_id", "transfer_date"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
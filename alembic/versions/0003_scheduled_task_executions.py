@@ -0,0 +1,33 @@
+"""Ключи идемпотентности выполнения задач планировщика
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_task_executions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "task_id", sa.Integer(), sa.ForeignKey("scheduled_tasks.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("period", sa.Date(), nullable=False),
+        sa.Column("executed_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("task_id", "period", name="uq_scheduled_task_executions_task_period"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduled_task_executions")
@@ -0,0 +1,38 @@
+"""Журнал запусков задач планировщика
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_task_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "task_id", sa.Integer(), sa.ForeignKey("scheduled_tasks.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("planned_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("outcome", sa.String(), nullable=False),
+        sa.Column("amount", sa.Numeric(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+    )
+    op.create_index("ix_scheduled_task_runs_task_id_started_at", "scheduled_task_runs", ["task_id", "started_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduled_task_runs_task_id_started_at", table_name="scheduled_task_runs")
+    op.drop_table("scheduled_task_runs")
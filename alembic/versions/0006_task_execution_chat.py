@@ -0,0 +1,35 @@
+"""Получатель в ключе идемпотентности запусков (напоминания по таймзонам пользователей)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "scheduled_task_executions", sa.Column("chat_id", sa.BigInteger(), server_default="0", nullable=False)
+    )
+    op.drop_constraint("uq_scheduled_task_executions_task_period", "scheduled_task_executions", type_="unique")
+    op.create_unique_constraint(
+        "uq_scheduled_task_executions_task_period_chat", "scheduled_task_executions", ["task_id", "period", "chat_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_scheduled_task_executions_task_period_chat", "scheduled_task_executions", type_="unique")
+    op.execute("DELETE FROM scheduled_task_executions WHERE chat_id <> 0")
+    op.create_unique_constraint(
+        "uq_scheduled_task_executions_task_period", "scheduled_task_executions", ["task_id", "period"]
+    )
+    op.drop_column("scheduled_task_executions", "chat_id")
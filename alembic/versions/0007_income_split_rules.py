@@ -0,0 +1,33 @@
+"""Правила распределения дохода
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "income_split_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("source_envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=False),
+        sa.Column("target_envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=False),
+        sa.Column("percent", sa.Numeric(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_income_split_rules_source_envelope_id", "income_split_rules", ["source_envelope_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_income_split_rules_source_envelope_id", table_name="income_split_rules")
+    op.drop_table("income_split_rules")
@@ -0,0 +1,35 @@
+"""Состояния диалогов FSM
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fsm_states",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("state", sa.String(), nullable=True),
+        sa.Column("data", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_fsm_states_key", "fsm_states", ["key"], unique=True)
+    op.create_index("ix_fsm_states_updated_at", "fsm_states", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fsm_states_updated_at", table_name="fsm_states")
+    op.drop_index("ix_fsm_states_key", table_name="fsm_states")
+    op.drop_table("fsm_states")
@@ -0,0 +1,78 @@
+"""Помесячные агрегаты операций
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_COLUMNS = "month, envelope_id, category_id, user_id, direction, amount, operations_count"
+
+TRANSACTIONS_ROLLUPS = """
+    SELECT date_trunc('month', t.transaction_date)::date, t.envelope_id, t.category_id, t.user_id, c.type,
+           sum(t.amount), count(*)
+    FROM transactions t
+    JOIN categories c ON c.id = t.category_id
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def transfers_rollups(envelope_column: str, direction: str) -> str:
+    return f"""
+        SELECT date_trunc('month', transfer_date)::date, {envelope_column}, NULL, NULL, '{direction}',
+               sum(amount), count(*)
+        FROM transfers
+        GROUP BY 1, 2
+    """
+
+
+def upgrade() -> None:
+    # Базы, на которых бот запускался до появления миграций, уже получили таблицу через create_all
+    if not sa.inspect(op.get_bind()).has_table("monthly_rollups"):
+        create_monthly_rollups()
+
+    # Агрегаты пересчитываются по всей истории операций вместе с появлением таблицы
+    op.execute("DELETE FROM monthly_rollups")
+
+    for rollups in (
+        TRANSACTIONS_ROLLUPS,
+        transfers_rollups("from_envelope_id", "transfer_out"),
+        transfers_rollups("to_envelope_id", "transfer_in"),
+    ):
+        op.execute(f"INSERT INTO monthly_rollups ({ROLLUP_COLUMNS}) {rollups}")
+
+
+def create_monthly_rollups() -> None:
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("envelope_id", sa.Integer(), sa.ForeignKey("envelopes.id"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("direction", sa.String(), nullable=False),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column("operations_count", sa.Integer(), nullable=False),
+        sa.UniqueConstraint(
+            "month",
+            "envelope_id",
+            "category_id",
+            "user_id",
+            "direction",
+            name="uq_monthly_rollups_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_rollups")
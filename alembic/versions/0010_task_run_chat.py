@@ -0,0 +1,24 @@
+"""Получатель в журнале запусков задач (напоминания пишутся по строке на пользователя)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("scheduled_task_runs", sa.Column("chat_id", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("scheduled_task_runs", "chat_id")
@@ -1,10 +1,6 @@
 #!/bin/bash
 set -e
 
-# Запускаем скрипт для наполнения БД
-echo "Running database seeding..."
-python -m scripts.seed
-
-# Запускаем основное приложение (бота)
+# Миграции схемы и наполнение БД выполняются самим ботом при старте
 echo "Starting bot..."
-exec python -m src.bot
\ No newline at end of file
+exec python -m src.bot
@@ -69,11 +69,12 @@ ORDER BY SUM("value") DESC;
 -- Вопрос 3: Прогресс по Главной Цели (для индикатора "Прогресс")
 -- ====================================================================
 SELECT
-    sum(t.amount) as current_amount
-FROM transfers t
-JOIN goals g ON t.to_envelope_id = g.linked_envelope_id
+    sum(r.amount) as current_amount
+FROM monthly_rollups r
+JOIN goals g ON r.envelope_id = g.linked_envelope_id
 JOIN system_state ss ON g.phase_id = ss.current_phase_id
-WHERE g.status = 'active';
+WHERE g.status = 'active'
+  AND r.direction = 'transfer_in';
 
 
 -- ====================================================================
@@ -82,15 +83,14 @@ WHERE g.status = 'active';
 WITH
   monthly_expenses_sums AS (
     SELECT
-      date_trunc('month', t.transaction_date) AS month,
-      SUM(t.amount) AS monthly_sum
+      r.month,
+      SUM(r.amount) AS monthly_sum
     FROM
-      transactions AS t
-      JOIN categories AS c ON t.category_id = c.id
+      monthly_rollups AS r
     WHERE
-      c.type = 'expense'
+      r.direction = 'expense'
     GROUP BY
-      month
+      r.month
   ),
   avg_monthly_expenses AS (
     SELECT
@@ -0,0 +1,190 @@
+import asyncio
+import datetime as dt
+import logging
+import sys
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from src.core.settings import settings
+from src.db.models import Transaction
+from src.db.repo_holder import RepoHolder
+
+logging.basicConfig(level=logging.INFO)
+
+# --- Параметры синтетического набора данных ---
+YEARS = 5
+ENVELOPES = 20
+CATEGORIES = 40
+TRANSACTIONS = 300_000
+TRANSFERS = 60_000
+
+START_DATE = dt.date.today().replace(day=1) - dt.timedelta(days=365 * YEARS)
+REPORT_MONTH = (dt.date.today().replace(day=1) - dt.timedelta(days=90)).replace(day=1)
+
+FILL_SQL = [
+    """
+    INSERT INTO users (telegram_id, username, timezone)
+    SELECT -g, 'explain_' || g, 'UTC' FROM generate_series(1, 2) AS g
+    """,
+    f"""
+    INSERT INTO categories (name, type, is_active)
+    SELECT 'explain_' || g, CASE WHEN g % 4 = 0 THEN 'income' ELSE 'expense' END, TRUE
+    FROM generate_series(1, {CATEGORIES}) AS g
+    """,
+    f"""
+    INSERT INTO envelopes (name, balance, is_active, is_savings)
+    SELECT 'explain_' || g, 0, TRUE, g % 5 = 0 FROM generate_series(1, {ENVELOPES}) AS g
+    """,
+    f"""
+    INSERT INTO transactions (user_id, category_id, envelope_id, amount, transaction_date)
+    SELECT
+        (SELECT array_agg(id) FROM users WHERE username LIKE 'explain_%')[1 + g % 2],
+        (SELECT array_agg(id) FROM categories WHERE name LIKE 'explain_%')[1 + g % {CATEGORIES}],
+        (SELECT array_agg(id) FROM envelopes WHERE name LIKE 'explain_%')[1 + g % {ENVELOPES}],
+        (random() * 5000)::numeric(12, 2),
+        DATE '{START_DATE}' + (random() * 365 * {YEARS})::int
+    FROM generate_series(1, {TRANSACTIONS}) AS g
+    """,
+    f"""
+    INSERT INTO transfers (from_envelope_id, to_envelope_id, amount, transfer_date)
+    SELECT
+        (SELECT array_agg(id) FROM envelopes WHERE name LIKE 'explain_%')[1 + g % {ENVELOPES}],
+        (SELECT array_agg(id) FROM envelopes WHERE name LIKE 'explain_%')[1 + (g + 1) % {ENVELOPES}],
+        (random() * 20000)::numeric(12, 2),
+        TIMESTAMP '{START_DATE}' + random() * INTERVAL '{365 * YEARS} days'
+    FROM generate_series(1, {TRANSFERS}) AS g
+    """,
+    # Агрегаты считаются так же, как при их появлении в миграции 0009
+    """
+    INSERT INTO monthly_rollups (month, envelope_id, category_id, user_id, direction, amount, operations_count)
+    SELECT date_trunc('month', t.transaction_date)::date, t.envelope_id, t.category_id, t.user_id, c.type,
+           sum(t.amount), count(*)
+    FROM transactions t
+    JOIN categories c ON c.id = t.category_id
+    WHERE c.name LIKE 'explain_%'
+    GROUP BY 1, 2, 3, 4, 5
+    """,
+    *(
+        f"""
+        INSERT INTO monthly_rollups (month, envelope_id, category_id, user_id, direction, amount, operations_count)
+        SELECT date_trunc('month', tr.transfer_date)::date, tr.{envelope_column}, NULL, NULL, '{direction}',
+               sum(tr.amount), count(*)
+        FROM transfers tr
+        JOIN envelopes e ON e.id = tr.{envelope_column}
+        WHERE e.name LIKE 'explain_%'
+        GROUP BY 1, 2
+        """
+        for envelope_column, direction in (("from_envelope_id", "transfer_out"), ("to_envelope_id", "transfer_in"))
+    ),
+    "ANALYZE users, categories, envelopes, transactions, transfers, monthly_rollups",
+]
+
+Check = tuple[str, str, Callable[[RepoHolder], Awaitable[Any]]]
+
+
+def build_checks(envelope_id: int, category_id: int) -> list[Check]:
+    """
+    Запросы отчетов из MonthlyRollupRepository и запрос Metabase с ожидаемым индексом.
+    Запросы репозитория не копируются сюда, а перехватываются при вызове его методов.
+    """
+    return [
+        (
+            "Доходы и расходы пользователей за месяц",
+            "uq_monthly_rollups_key",
+            lambda repo: repo.monthly_rollup.get_totals_by_user_for_month(REPORT_MONTH),
+        ),
+        (
+            "Накопления за месяц",
+            "uq_monthly_rollups_key",
+            lambda repo: repo.monthly_rollup.get_savings_total_for_month(REPORT_MONTH),
+        ),
+        (
+            "Движение по конверту за месяц",
+            "uq_monthly_rollups_key",
+            lambda repo: repo.monthly_rollup.get_envelope_flows_for_month(envelope_id, REPORT_MONTH),
+        ),
+        (
+            "Движение по конверту после месяца",
+            "uq_monthly_rollups_key",
+            lambda repo: repo.monthly_rollup.get_envelope_net_after_month(envelope_id, REPORT_MONTH),
+        ),
+        (
+            "Транзакции категории (фильтр Metabase)",
+            "ix_transactions_category_id",
+            lambda repo: repo.session.execute(select(Transaction).where(Transaction.category_id == category_id)),
+        ),
+    ]
+
+
+async def capture_statements(conn: AsyncConnection, call: Callable[[RepoHolder], Awaitable[Any]]) -> list[tuple]:
+    """Выполняет call в сессии поверх conn и возвращает отправленные в БД запросы с параметрами."""
+    statements = []
+
+    def remember(connection, cursor, statement, parameters, context, executemany) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(conn.sync_connection, "before_cursor_execute", remember)
+
+    try:
+        # Сессия работает внутри транзакции conn и не коммитит: синтетические данные откатываются вместе с ней
+        async with AsyncSession(bind=conn) as session:
+            await call(RepoHolder(session))
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", remember)
+
+    return statements
+
+
+def collect_index_names(plan_node: dict) -> set[str]:
+    """Собирает имена индексов из всех узлов плана EXPLAIN (FORMAT JSON)."""
+    names = {plan_node["Index Name"]} if "Index Name" in plan_node else set()
+
+    for child in plan_node.get("Plans", []):
+        names |= collect_index_names(child)
+
+    return names
+
+
+async def explain_indexes() -> bool:
+    """
+    Заполняет БД многолетним синтетическим набором данных, проверяет через EXPLAIN,
+    что запросы отчетов к помесячным агрегатам идут по индексам, и откатывает все изменения.
+    """
+    engine = create_async_engine(str(settings.database_url))
+    all_passed = True
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+
+        try:
+            logging.info(f"Генерация {TRANSACTIONS} транзакций и {TRANSFERS} переводов за {YEARS} лет...")
+            for statement in FILL_SQL:
+                await conn.execute(text(statement))
+
+            envelope_id = await conn.scalar(text("SELECT min(id) FROM envelopes WHERE name LIKE 'explain_%'"))
+            category_id = await conn.scalar(text("SELECT min(id) FROM categories WHERE name LIKE 'explain_%'"))
+
+            for title, index_name, call in build_checks(envelope_id, category_id):
+                used_indexes = set()
+
+                for statement, parameters in await capture_statements(conn, call):
+                    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+                    used_indexes |= collect_index_names(plan[0]["Plan"])
+
+                passed = index_name in used_indexes
+                all_passed &= passed
+
+                status = "OK" if passed else "FAIL"
+                logging.info(f"[{status}] {title}: ожидался {index_name}, в плане {sorted(used_indexes) or 'Seq Scan'}")
+        finally:
+            # Синтетические данные не должны остаться в базе
+            await transaction.rollback()
+
+    await engine.dispose()
+    return all_passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(explain_indexes()) else 1)
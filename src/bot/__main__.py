@@ -3,14 +3,16 @@ import logging
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
-from aiogram.fsm.storage.memory import MemoryStorage
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from aiogram.fsm.storage.memory import SimpleEventIsolation
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from src.bot.fsm_storage import PostgresStorage
 from src.bot.handlers import (
     categories,
     common,
     envelopes,
     goals,
+    income_split,
     manage,
     phases,
     quest,
@@ -19,28 +21,56 @@ from src.bot.handlers import (
     transactions,
 )
 from src.bot.middlewares.auth import AuthMiddleware
+from src.bot.middlewares.fsm_flush import FsmFlushMiddleware
 from src.bot.middlewares.repo import RepoMiddleware
+from src.bot.middlewares.user import UserMiddleware
+from src.bot.webhook import run_webhook
 from src.core.settings import settings
-from src.db.utils import create_db_tables
-from src.services.scheduler import reload_scheduler_jobs, start_scheduler
+from src.db.locks import SCHEDULER_LEADER_LOCK
+from src.db.seed import seed_data
+from src.db.utils import create_db_engine, ensure_schema
+from src.services.leader import LeaderElection
+from src.services.notifications import notification_dispatcher
+from src.services.scheduler import (
+    shutdown_scheduler,
+    start_scheduler_on_leader,
+    stop_scheduler_on_demotion,
+)
 
 logging.basicConfig(level=logging.INFO)
 
 
 async def main() -> None:
-    engine = create_async_engine(str(settings.database_url), echo=True)
+    # Один движок и пул соединений на процесс: их используют хендлеры, джобы планировщика и сид
+    engine = create_db_engine()
     session_pool = async_sessionmaker(engine, expire_on_commit=False)
 
-    await create_db_tables(engine=engine)
-    storage = MemoryStorage()
+    # Миграции и сид выполняются в этом же процессе и на том же движке
+    await ensure_schema(engine)
+    await seed_data(session_pool)
+
+    # Состояния диалогов переживают перезапуск и доступны всем экземплярам бота
+    storage = PostgresStorage(
+        engine,
+        session_pool,
+        state_ttl=settings.fsm_state_ttl,
+        cache_max_size=settings.fsm_cache_max_size,
+        cleanup_interval=settings.fsm_cleanup_interval,
+    )
+    storage.start()
 
     # Инициализация бота и диспетчера
     bot = Bot(token=settings.bot_token, default=DefaultBotProperties(parse_mode="HTML"))
-    dp = Dispatcher(storage=storage, session_pool=session_pool)
+    # Апдейты одного чата обрабатываются по очереди: состояние FSM читается уже под блокировкой,
+    # поэтому повторное нажатие на кнопку видит результат первого
+    dp = Dispatcher(storage=storage, events_isolation=SimpleEventIsolation(), session_pool=session_pool)
 
     # Подключаем middleware для аутентификации
     dp.update.middleware(AuthMiddleware())
+    # Состояние FSM пишется в БД после коммита изменений хендлера, но до конца обработки апдейта
+    dp.update.middleware(FsmFlushMiddleware(storage))
     dp.update.middleware(RepoMiddleware(session_pool=session_pool))
+    dp.update.middleware(UserMiddleware())
 
     # Подключаем роутеры
     dp.include_router(common.router)
@@ -53,16 +83,35 @@ async def main() -> None:
     dp.include_router(envelopes.router)
     dp.include_router(categories.router)
     dp.include_router(scheduler.router)
+    dp.include_router(income_split.router)
+
+    notification_dispatcher.setup(session_pool)
 
-    start_scheduler()
-    await reload_scheduler_jobs(bot, session_pool)
+    # Планировщик работает только на одном экземпляре — держателе advisory-блокировки
+    leader_election = LeaderElection(
+        engine,
+        SCHEDULER_LEADER_LOCK,
+        on_elected=lambda: start_scheduler_on_leader(bot, session_pool),
+        on_demoted=stop_scheduler_on_demotion,
+        interval=settings.scheduler_leader_interval,
+    )
+    leader_task = asyncio.create_task(leader_election.run())
 
     # Запуск бота
     try:
-        await bot.delete_webhook(drop_pending_updates=True)
-        await dp.start_polling(bot)
+        if settings.bot_mode == "webhook":
+            await run_webhook(dp, bot)
+        else:
+            await bot.delete_webhook(drop_pending_updates=True)
+            await dp.start_polling(bot)
     finally:
+        leader_task.cancel()
+        await asyncio.gather(leader_task, return_exceptions=True)
+        shutdown_scheduler()
+        await notification_dispatcher.shutdown()
+        await storage.close()
         await bot.session.close()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
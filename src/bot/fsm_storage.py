@@ -0,0 +1,277 @@
+import asyncio
+import datetime as dt
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.db.repo_holder import RepoHolder
+from src.db.repositories.fsm_state import FSM_STATES_CHANNEL
+from src.db.unit_of_work import unit_of_work
+
+DECIMAL_KEY = "__decimal__"
+EMPTY_DATA = "{}"
+
+# Период повтора записи, если БД была недоступна, и период проверки соединения LISTEN
+MAINTENANCE_INTERVAL = 5.0
+LISTEN_HEARTBEAT = 5.0
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return {DECIMAL_KEY: str(value)}
+    raise TypeError(f"Значение типа {type(value).__name__} нельзя сохранить в состоянии FSM")
+
+
+def _decode_object(obj: dict) -> Any:
+    if obj.keys() == {DECIMAL_KEY}:
+        return Decimal(obj[DECIMAL_KEY])
+    return obj
+
+
+def dump_data(data: Mapping[str, Any]) -> str:
+    """Данные FSM в JSON; суммы (Decimal) сохраняются без потери точности."""
+    return json.dumps(data, default=_encode_value, ensure_ascii=False, sort_keys=True)
+
+
+def load_data(raw: str) -> dict[str, Any]:
+    return json.loads(raw, object_hook=_decode_object)
+
+
+class _Entry(NamedTuple):
+    state: str | None
+    data: str  # JSON, см. dump_data
+    updated_at: dt.datetime
+
+
+class PostgresStorage(BaseStorage):
+    """
+    Хранилище состояний FSM в Postgres с кэшем в памяти.
+
+    Чтения обслуживаются из LRU ограниченного размера. Изменения копятся в буфере, пока
+    обрабатывается апдейт, и записываются в БД одним запросом до окончания его обработки
+    (см. FsmFlushMiddleware), поэтому другой процесс бота сразу видит новое состояние.
+    Не записанное из-за недоступности БД повторяется в фоне; там же периодически удаляются
+    состояния, не менявшиеся дольше TTL. Процессы бота сообщают друг другу об измененных ключах
+    через LISTEN/NOTIFY; пока канал уведомлений недоступен, кэш не используется и чтения идут в БД.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_pool: async_sessionmaker,
+        state_ttl: float,
+        cache_max_size: int,
+        cleanup_interval: float,
+    ) -> None:
+        self.engine = engine
+        self.session_pool = session_pool
+        self.state_ttl = dt.timedelta(seconds=state_ttl)
+        self.cache_max_size = cache_max_size
+        self.cleanup_interval = cleanup_interval
+        self.key_builder = DefaultKeyBuilder(prefix="fsm", with_bot_id=True, with_destiny=True)
+        self._instance_id = uuid.uuid4().hex
+        self._cache: OrderedDict[str, _Entry] = OrderedDict()
+        self._pending: dict[str, _Entry] = {}
+        self._generation = 0  # растет при каждой инвалидации кэша
+        self._listening = False
+        self._cleaned_at = float("-inf")
+        self._flush_lock = asyncio.Lock()
+        self._maintenance_task: asyncio.Task | None = None
+        self._listen_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Подписывается на изменения состояний из других процессов и запускает фоновую задачу."""
+        if self._listen_task is None:
+            self._listen_task = asyncio.create_task(self._listen())
+
+        if self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def close(self) -> None:
+        """Останавливает фоновые задачи и сохраняет еще не записанные состояния."""
+        for task in (self._listen_task, self._maintenance_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        self._listen_task = self._maintenance_task = None
+        await self.flush()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return (await self._get(self.key_builder.build(key))).state
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = self.key_builder.build(key)
+        entry = await self._get(storage_key)
+        self._put(storage_key, entry, state.state if isinstance(state, State) else state, entry.data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return load_data((await self._get(self.key_builder.build(key))).data)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        storage_key = self.key_builder.build(key)
+        entry = await self._get(storage_key)
+        self._put(storage_key, entry, entry.state, dump_data(data))
+
+    def _expired_before(self) -> dt.datetime:
+        return dt.datetime.now(dt.timezone.utc) - self.state_ttl
+
+    async def _get(self, key: str) -> _Entry:
+        entry = self._pending.get(key)
+
+        if entry is None and self._listening:
+            entry = self._cache.get(key)
+
+            if entry is not None:
+                self._cache.move_to_end(key)
+
+        if entry is None:
+            generation = self._generation
+            entry = await self._load(key)
+
+            # Пока шло чтение, ключ мог измениться здесь или в другом процессе — тогда не кэшируем
+            if self._listening and generation == self._generation and key not in self._cache:
+                self._remember(key, entry)
+
+        if entry.updated_at < self._expired_before():
+            return _Entry(None, EMPTY_DATA, entry.updated_at)
+
+        return entry
+
+    async def _load(self, key: str) -> _Entry:
+        async with self.session_pool() as session:
+            row = await RepoHolder(session).fsm_state.get_by_key(key, self._expired_before())
+
+        if row is None:
+            return _Entry(None, EMPTY_DATA, dt.datetime.now(dt.timezone.utc))
+
+        return _Entry(row.state, row.data, row.updated_at)
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.cache_max_size:
+            self._cache.popitem(last=False)
+
+    def _put(self, key: str, current: _Entry, state: str | None, data: str) -> None:
+        # Например, state.clear() без активного диалога: писать в БД нечего
+        if current.state == state and current.data == data:
+            return
+
+        entry = _Entry(state, data, dt.datetime.now(dt.timezone.utc))
+        self._pending[key] = entry
+        self._remember(key, entry)
+
+    async def flush_key(self, key: StorageKey) -> bool:
+        """Записывает изменения состояния одного чата. Возвращает False, если БД недоступна."""
+        return await self.flush([self.key_builder.build(key)])
+
+    async def flush(self, keys: Iterable[str] | None = None) -> bool:
+        """
+        Записывает накопленные изменения (все или только по ключам keys) одной транзакцией.
+        Возвращает False, если БД недоступна: изменения останутся в буфере до следующей попытки.
+        """
+        async with self._flush_lock:
+            if keys is None:
+                batch, self._pending = self._pending, {}
+            else:
+                batch = {key: self._pending.pop(key) for key in keys if key in self._pending}
+
+            if not batch:
+                return True
+
+            try:
+                async with self.session_pool() as session, unit_of_work(session):
+                    repo = RepoHolder(session)
+                    # Пустое состояние (диалог завершен) не храним
+                    await repo.fsm_state.upsert_many(
+                        [
+                            {"key": key, "state": entry.state, "data": entry.data, "updated_at": entry.updated_at}
+                            for key, entry in batch.items()
+                            if entry.state is not None or entry.data != EMPTY_DATA
+                        ]
+                    )
+                    await repo.fsm_state.delete_by_keys(
+                        [key for key, entry in batch.items() if entry.state is None and entry.data == EMPTY_DATA]
+                    )
+                    await repo.fsm_state.notify_changed([f"{self._instance_id}:{key}" for key in batch])
+            except asyncio.CancelledError:
+                self._restore_pending(batch)
+                raise
+            except Exception:
+                logging.exception("Не удалось сохранить состояния FSM, повторим позже.")
+                self._restore_pending(batch)
+                return False
+
+            return True
+
+    def _restore_pending(self, batch: dict[str, _Entry]) -> None:
+        # Более новые записи, пришедшие за время сброса, не затираем
+        for key, entry in batch.items():
+            self._pending.setdefault(key, entry)
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+            if self._pending:
+                await self.flush()
+
+            if time.monotonic() - self._cleaned_at < self.cleanup_interval:
+                continue
+
+            try:
+                async with self.session_pool() as session, unit_of_work(session):
+                    deleted = await RepoHolder(session).fsm_state.delete_expired(self._expired_before())
+            except Exception:
+                logging.exception("Не удалось удалить брошенные состояния FSM, повторим позже.")
+                continue
+
+            self._cleaned_at = time.monotonic()
+            logging.info(f"Удалено брошенных состояний FSM: {deleted}")
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        instance_id, _, key = payload.partition(":")
+
+        if instance_id != self._instance_id:
+            self._generation += 1
+            self._cache.pop(key, None)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    # Вне транзакции: Postgres доставляет уведомления только между транзакциями
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    raw_connection = await conn.get_raw_connection()
+                    await raw_connection.driver_connection.add_listener(FSM_STATES_CHANNEL, self._on_notify)
+
+                    # Пока подписки не было, другие процессы могли поменять любые состояния
+                    self._generation += 1
+                    self._cache.clear()
+                    self._listening = True
+
+                    try:
+                        while True:
+                            await asyncio.sleep(LISTEN_HEARTBEAT)
+                            await asyncio.wait_for(conn.execute(select(1)), timeout=LISTEN_HEARTBEAT)
+                    finally:
+                        self._listening = False
+                        # Закрываем соединение, а не возвращаем в пул: вместе с ним снимается подписка
+                        await conn.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Нет подписки на изменения состояний FSM, кэш отключен до переподключения.")
+
+            await asyncio.sleep(LISTEN_HEARTBEAT)
@@ -1,12 +1,16 @@
 import pytz
-from aiogram import F, Router
+from aiogram import Bot, F, Router
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.bot.keyboards import get_main_menu_keyboard
 from src.bot.states import CommonStates
+from src.core.timezones import get_timezone
+from src.db.models.user import User
 from src.db.repo_holder import RepoHolder
+from src.services.scheduler import request_scheduler_sync
 
 router = Router()
 
@@ -29,11 +33,15 @@ async def set_timezone_start(message: Message, state: FSMContext):
 
 
 @router.message(CommonStates.waiting_for_timezone)
-async def set_timezone_finish(message: Message, state: FSMContext, repo: RepoHolder):
+async def set_timezone_finish(
+    message: Message, state: FSMContext, repo: RepoHolder, bot: Bot, session_pool: async_sessionmaker, user: User
+):
     try:
-        pytz.timezone(message.text)
-        user = await repo.user.get_or_create(message.from_user.id, message.from_user.username)
+        get_timezone(message.text)
         await repo.user.update(user, timezone=message.text)
+        # Напоминания пользователя переносятся на его новое местное время
+        await repo.commit()
+        request_scheduler_sync(bot, session_pool)
         await message.answer(f"✅ Ваша таймзона успешно установлена на `{message.text}`.")
     except pytz.UnknownTimeZoneError:
         await message.answer(
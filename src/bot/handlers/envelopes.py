@@ -4,14 +4,14 @@ from aiogram.types import CallbackQuery, Message
 
 from src.bot.keyboards import get_edit_envelope_keyboard, get_items_for_action_keyboard
 from src.bot.states import AddEnvelope, ArchiveTransfer, EditEnvelope
+from src.db.models.user import User
 from src.db.repo_holder import RepoHolder
 
 router = Router()
 
 
 @router.callback_query(F.data == "list_envelopes")
-async def list_envelopes(callback: CallbackQuery, repo: RepoHolder):
-    user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
+async def list_envelopes(callback: CallbackQuery, repo: RepoHolder, user: User):
     envelopes = await repo.envelope.get_all_active(user.id)
 
     if not envelopes:
@@ -37,8 +37,7 @@ async def add_envelope_start(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data == "edit_envelope_menu")
-async def edit_envelope_menu(callback: CallbackQuery, repo: RepoHolder):
-    user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
+async def edit_envelope_menu(callback: CallbackQuery, repo: RepoHolder, user: User):
     envelopes = await repo.envelope.get_all_active(user.id)
     await callback.message.edit_text(
         "Выберите конверт для редактирования:",
@@ -103,11 +102,10 @@ async def toggle_savings_envelope(callback: CallbackQuery, repo: RepoHolder):
 
 
 @router.message(AddEnvelope.choosing_name)
-async def add_envelope_name_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def add_envelope_name_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot, user: User):
     data = await state.get_data()
     original_message_id = data.get("_original_message_id")
 
-    user = await repo.user.get_or_create(message.from_user.id, message.from_user.username)
     await repo.envelope.create(name=message.text, owner_id=user.id)
 
     await state.clear()
@@ -119,7 +117,7 @@ async def add_envelope_name_chosen(message: Message, state: FSMContext, repo: Re
 
 
 @router.callback_query(F.data.startswith("archive:envelope:"))
-async def archive_envelope(callback: CallbackQuery, repo: RepoHolder, state: FSMContext):
+async def archive_envelope(callback: CallbackQuery, repo: RepoHolder, state: FSMContext, user: User):
     envelope_id = int(callback.data.split(":")[2])
     envelope = await repo.envelope.get_by_id(envelope_id)
 
@@ -131,7 +129,6 @@ async def archive_envelope(callback: CallbackQuery, repo: RepoHolder, state: FSM
         await state.set_state(ArchiveTransfer.choosing_envelope_to)
         await state.update_data(from_envelope_id=envelope.id, amount=envelope.balance)
 
-        user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
         all_envelopes = await repo.envelope.get_all_active(user.id)
         other_envelopes = [env for env in all_envelopes if env.id != envelope.id]
 
@@ -156,17 +153,38 @@ async def archive_transfer_to_chosen(callback: CallbackQuery, state: FSMContext,
     from_envelope_id = data.get("from_envelope_id")
     amount = data.get("amount")
 
-    env_from = await repo.envelope.get_by_id(from_envelope_id)
-    env_to = await repo.envelope.get_by_id(to_envelope_id)
+    # Диалог уже завершен (например, кнопку нажали повторно) — переводить нечего
+    if amount is None or from_envelope_id is None:
+        await state.clear()
+        await callback.answer()
+        return
+
+    # Клавиатура не предлагает архивируемый конверт, но устаревшая кнопка или подделанный callback могут
+    if to_envelope_id == from_envelope_id:
+        await callback.answer("❌ Нельзя перевести остаток на тот же конверт.", show_alert=True)
+        return
+
+    envelopes = {
+        env.id: env for env in await repo.envelope.get_by_ids_for_update(sorted({from_envelope_id, to_envelope_id}))
+    }
+    env_from = envelopes.get(from_envelope_id)
+    env_to = envelopes.get(to_envelope_id)
 
     if not env_from or not env_to:
         await callback.message.edit_text("❌ Ошибка: один из конвертов не найден.")
         await state.clear()
         return
 
+    # Остаток сверяем под блокировкой: иначе пополнение, пришедшее после выбора конверта, осталось бы в архиве
+    balance_changed = env_from.balance != amount
+
+    if balance_changed or await repo.envelope.move_balance(env_from.id, env_to.id, amount) is None:
+        await callback.message.edit_text(f"❌ Остаток на конверте «{env_from.name}» изменился, попробуйте еще раз.")
+        await state.clear()
+        return
+
     await repo.transfer.create(from_envelope_id=env_from.id, to_envelope_id=env_to.id, amount=amount)
-    await repo.envelope.update(env_from, balance=0, is_active=False)
-    await repo.envelope.update(env_to, balance=env_to.balance + amount)
+    await repo.envelope.update(env_from, is_active=False)
 
     await state.clear()
     await callback.message.edit_text(
@@ -176,8 +194,7 @@ async def archive_transfer_to_chosen(callback: CallbackQuery, state: FSMContext,
 
 
 @router.message(F.text == "💰 Мой баланс")
-async def show_my_balance(message: Message, repo: RepoHolder):
-    user = await repo.user.get_or_create(message.from_user.id, message.from_user.username)
+async def show_my_balance(message: Message, repo: RepoHolder, user: User):
     income_envelope = await repo.envelope.get_by_owner_id(user.id)
 
     if not income_envelope:
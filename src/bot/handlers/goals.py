@@ -6,6 +6,7 @@ from aiogram.types import CallbackQuery, Message
 
 from src.bot.keyboards import get_items_for_action_keyboard
 from src.bot.states import AddGoal, EditGoal
+from src.db.models.user import User
 from src.db.repo_holder import RepoHolder
 
 router = Router()
@@ -68,7 +69,7 @@ async def add_goal_name_chosen(message: Message, state: FSMContext, bot: Bot):
 
 
 @router.message(AddGoal.choosing_target_amount)
-async def add_goal_amount_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def add_goal_amount_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot, user: User):
     try:
         target_amount = Decimal(message.text.replace(",", "."))
     except InvalidOperation:
@@ -77,7 +78,6 @@ async def add_goal_amount_chosen(message: Message, state: FSMContext, repo: Repo
 
     await state.update_data(target_amount=target_amount)
 
-    user = await repo.user.get_or_create(message.from_user.id, message.from_user.username)
     envelopes = await repo.envelope.get_all_active(user.id)
     await state.set_state(AddGoal.choosing_envelope)
     data = await state.get_data()
@@ -0,0 +1,150 @@
+from decimal import Decimal, InvalidOperation
+
+from aiogram import Bot, F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
+
+from src.bot.keyboards import get_income_split_manage_menu, get_items_for_action_keyboard
+from src.bot.states import AddIncomeSplitRule
+from src.db.models import IncomeSplitRule, User
+from src.db.repo_holder import RepoHolder
+
+router = Router()
+
+# Доход распределяется не больше чем на 100%: остаток остается на конверте-источнике
+MAX_TOTAL_PERCENT = Decimal(100)
+
+
+def get_split_rule_keyboard(rule: IncomeSplitRule) -> InlineKeyboardMarkup:
+    """Кнопка включения/выключения правила."""
+    builder = InlineKeyboardBuilder()
+    builder.row(
+        InlineKeyboardButton(
+            text="✅ Включено" if rule.is_active else "❌ Выключено", callback_data=f"toggle_split_rule:{rule.id}"
+        )
+    )
+    return builder.as_markup()
+
+
+@router.callback_query(F.data == "manage_income_split")
+async def to_income_split_menu(callback: CallbackQuery):
+    await callback.message.edit_text(
+        "Правила распределения дохода: при зачислении дохода на конверт его доля сразу переводится на другие.",
+        reply_markup=get_income_split_manage_menu(),
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data == "list_split_rules")
+async def list_split_rules(callback: CallbackQuery, repo: RepoHolder):
+    rules = await repo.income_split_rule.get_all_ordered()
+
+    if not rules:
+        await callback.answer("Правил распределения пока нет.", show_alert=True)
+        return
+
+    envelope_names = {envelope.id: envelope.name for envelope in await repo.envelope.get_all()}
+    await callback.message.edit_text("Правила распределения дохода:")
+
+    for rule in rules:
+        text = (
+            f"«{envelope_names.get(rule.source_envelope_id)}» → «{envelope_names.get(rule.target_envelope_id)}»: "
+            f"{rule.percent:g}%"
+        )
+        await callback.message.answer(text, reply_markup=get_split_rule_keyboard(rule))
+
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("toggle_split_rule:"))
+async def toggle_split_rule(callback: CallbackQuery, repo: RepoHolder):
+    rule = await repo.income_split_rule.get_by_id(int(callback.data.split(":")[1]))
+
+    if not rule:
+        return await callback.answer("Правило не найдено.", show_alert=True)
+
+    if not rule.is_active:
+        total = await repo.income_split_rule.get_active_percent_total(rule.source_envelope_id)
+
+        if total + rule.percent > MAX_TOTAL_PERCENT:
+            return await callback.answer(
+                f"Нельзя включить: по конверту уже распределяется {total:g}%, вместе будет больше 100%.",
+                show_alert=True,
+            )
+
+    await repo.income_split_rule.update(rule, is_active=not rule.is_active)
+    await callback.message.edit_reply_markup(reply_markup=get_split_rule_keyboard(rule))
+    await callback.answer("Правило включено." if rule.is_active else "Правило выключено.")
+
+
+@router.callback_query(F.data == "add_split_rule")
+async def add_split_rule_start(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, user: User):
+    envelopes = await repo.envelope.get_all_active(user.id)
+
+    await state.set_state(AddIncomeSplitRule.choosing_source)
+    await callback.message.edit_text(
+        "На какой конверт зачисляется доход, который нужно распределять?",
+        reply_markup=get_items_for_action_keyboard(envelopes, "split_source", "envelope"),
+    )
+    await callback.answer()
+
+
+@router.callback_query(AddIncomeSplitRule.choosing_source, F.data.startswith("split_source:envelope:"))
+async def add_split_rule_source_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, user: User):
+    source_id = int(callback.data.split(":")[-1])
+    await state.update_data(source_envelope_id=source_id)
+
+    envelopes = [env for env in await repo.envelope.get_all_active(user.id) if env.id != source_id]
+
+    await state.set_state(AddIncomeSplitRule.choosing_target)
+    await callback.message.edit_text(
+        "На какой конверт переводить долю дохода?",
+        reply_markup=get_items_for_action_keyboard(envelopes, "split_target", "envelope"),
+    )
+    await callback.answer()
+
+
+@router.callback_query(AddIncomeSplitRule.choosing_target, F.data.startswith("split_target:envelope:"))
+async def add_split_rule_target_chosen(callback: CallbackQuery, state: FSMContext):
+    await state.update_data(
+        target_envelope_id=int(callback.data.split(":")[-1]), _original_message_id=callback.message.message_id
+    )
+    await state.set_state(AddIncomeSplitRule.waiting_for_percent)
+    await callback.message.edit_text("Какой процент дохода переводить? Введите число от 0 до 100:")
+    await callback.answer()
+
+
+@router.message(AddIncomeSplitRule.waiting_for_percent)
+async def add_split_rule_percent_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot):
+    try:
+        percent = Decimal(message.text.replace(",", ".").rstrip("%").strip())
+
+        if not 0 < percent <= MAX_TOTAL_PERCENT:
+            raise ValueError
+    except (InvalidOperation, ValueError):
+        await message.answer("Нужно ввести число больше 0 и не больше 100. Попробуйте снова.")
+        return
+
+    data = await state.get_data()
+    source_envelope_id = data.get("source_envelope_id")
+    total = await repo.income_split_rule.get_active_percent_total(source_envelope_id)
+
+    if total + percent > MAX_TOTAL_PERCENT:
+        await message.answer(
+            f"По этому конверту уже распределяется {total:g}%, можно добавить не больше "
+            f"{MAX_TOTAL_PERCENT - total:g}%. Попробуйте снова."
+        )
+        return
+
+    await repo.income_split_rule.create(
+        source_envelope_id=source_envelope_id, target_envelope_id=data.get("target_envelope_id"), percent=percent
+    )
+    await state.clear()
+
+    if data.get("_original_message_id"):
+        await bot.edit_message_text(
+            f"✅ Правило создано: {percent:g}% каждого дохода будет переводиться автоматически.",
+            chat_id=message.chat.id,
+            message_id=data.get("_original_message_id"),
+        )
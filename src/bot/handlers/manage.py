@@ -23,7 +23,10 @@ def get_main_manage_keyboard():
         InlineKeyboardButton(text="🎯 Цели", callback_data="manage_goals"),
         InlineKeyboardButton(text="🗺️ Фазы", callback_data="manage_phases"),
     )
-    builder.row(InlineKeyboardButton(text="🔔 Напоминания", callback_data="manage_scheduler"))
+    builder.row(
+        InlineKeyboardButton(text="🔔 Напоминания", callback_data="manage_scheduler"),
+        InlineKeyboardButton(text="🔀 Распределение дохода", callback_data="manage_income_split"),
+    )
 
     return builder.as_markup()
 
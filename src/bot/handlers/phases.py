@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 from src.bot.keyboards import get_edit_phase_keyboard, get_items_for_action_keyboard, get_phases_keyboard
 from src.bot.states import AddPhase, EditPhase
 from src.db.repo_holder import RepoHolder
-from src.services.scheduler import reload_scheduler_jobs
+from src.services.scheduler import request_scheduler_sync
 
 router = Router()
 
@@ -30,7 +30,8 @@ async def set_user_phase(callback: CallbackQuery, repo: RepoHolder, bot: Bot, se
 
     if not system_state:
         await repo.state.create(id=1, current_phase_id=phase_id)
-        await reload_scheduler_jobs(bot, session_pool)
+        await repo.commit()
+        request_scheduler_sync(bot, session_pool)
         await callback.answer("✅ Начальная фаза установлена. Расписание загружено.", show_alert=True)
         await list_phases(callback, repo)
         return
@@ -79,8 +80,9 @@ async def set_user_phase(callback: CallbackQuery, repo: RepoHolder, bot: Bot, se
     # 3. Устанавливаем новую фазу
     await repo.state.update(system_state, current_phase_id=phase_id)
 
-    # 4. Перезагружаем расписание
-    await reload_scheduler_jobs(bot, session_pool)
+    # 4. Фиксируем смену фазы одной транзакцией и перезагружаем расписание
+    await repo.commit()
+    request_scheduler_sync(bot, session_pool)
 
     new_phase = await repo.phase.get_by_id(phase_id)
     await callback.answer(f"✅ Установлена фаза: {new_phase.name}. Расписание обновлено.", show_alert=True)
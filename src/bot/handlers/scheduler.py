@@ -1,18 +1,42 @@
+import datetime as dt
+import html
 from decimal import Decimal, InvalidOperation
 
 from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
+from pytz import BaseTzInfo
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.bot.keyboards import get_items_for_action_keyboard, get_task_type_keyboard
 from src.bot.states import AddScheduledTask
+from src.db.models.user import User
 from src.db.repo_holder import RepoHolder
-from src.services.scheduler import reload_scheduler_jobs
+from src.db.repositories.scheduled_task_run import (
+    OUTCOME_ERROR,
+    OUTCOME_INSUFFICIENT_FUNDS,
+    OUTCOME_LOCKED,
+    OUTCOME_SKIPPED,
+    OUTCOME_SUCCESS,
+)
+from src.services.scheduler import get_task_trigger, get_user_timezones, request_scheduler_sync
 
 router = Router()
 
+# Сколько ближайших запусков показывать в предпросмотре расписания задачи
+TASK_PREVIEW_COUNT = 12
+# Сколько последних запусков показывать в истории задачи
+TASK_RUNS_COUNT = 10
+
+RUN_OUTCOME_ICONS = {
+    OUTCOME_SUCCESS: "✅",
+    OUTCOME_INSUFFICIENT_FUNDS: "💸",
+    OUTCOME_SKIPPED: "⏭",
+    OUTCOME_LOCKED: "🔒",
+    OUTCOME_ERROR: "❌",
+}
+
 
 @router.callback_query(F.data == "list_tasks")
 async def list_scheduled_tasks(callback: CallbackQuery, repo: RepoHolder):
@@ -44,8 +68,10 @@ async def list_scheduled_tasks(callback: CallbackQuery, repo: RepoHolder):
         builder.row(
             InlineKeyboardButton(
                 text="✅ Включено" if task.is_active else "❌ Выключено", callback_data=f"toggle_task:{task.id}"
-            )
+            ),
+            InlineKeyboardButton(text="📅 Ближайшие запуски", callback_data=f"task_preview:{task.id}"),
         )
+        builder.row(InlineKeyboardButton(text="🧾 История запусков", callback_data=f"task_runs:{task.id}"))
         await callback.message.answer(text, reply_markup=builder.as_markup())
 
     await callback.answer()
@@ -60,11 +86,81 @@ async def toggle_task_status(callback: CallbackQuery, repo: RepoHolder, bot: Bot
         return await callback.answer("Задача не найдена.", show_alert=True)
 
     await repo.scheduled_task.update(task, is_active=not task.is_active)
-    await reload_scheduler_jobs(bot, session_pool)
+    await repo.commit()
+    request_scheduler_sync(bot, session_pool)
     await callback.answer("Статус задачи изменен. Расписание перезагружено.", show_alert=True)
     await list_scheduled_tasks(callback, repo)
 
 
+@router.callback_query(F.data.startswith("task_preview:"))
+async def show_task_preview(callback: CallbackQuery, repo: RepoHolder, user: User):
+    """Показывает ближайшие запуски задачи с учетом переноса на рабочие дни."""
+    task = await repo.scheduled_task.get_by_id(int(callback.data.split(":")[1]))
+
+    if not task:
+        return await callback.answer("Задача не найдена.", show_alert=True)
+
+    # Напоминание приходит каждому в его местное время, авто-перевод выполняется по таймзоне планировщика.
+    # Таймзоны берем из БД так же, как при синхронизации: на резервном экземпляре планировщик не запущен
+    scheduler_timezone, user_timezones = await get_user_timezones(repo.session)
+    timezone = scheduler_timezone
+    if task.task_type == "reminder":
+        timezone = user_timezones.get(user.telegram_id, scheduler_timezone)
+
+    trigger = get_task_trigger(task, timezone)
+    fire_times = trigger.get_next_fire_times(TASK_PREVIEW_COUNT, dt.datetime.now(tz=trigger.timezone))
+
+    lines = [f"📅 Ближайшие запуски (каждый {task.cron_day}-й день в {task.cron_hour}:00):"]
+
+    for fire_time in fire_times:
+        moved_note = " — перенос" if fire_time.day != int(task.cron_day) else ""
+        lines.append(f" • {fire_time:%d.%m.%Y %H:%M}{moved_note}")
+
+    await callback.message.answer("\n".join(lines))
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("task_runs:"))
+async def show_task_runs(callback: CallbackQuery, repo: RepoHolder, user_timezone: BaseTzInfo):
+    """Показывает последние запуски задачи: задержку относительно расписания, длительность и итог."""
+    task_id = int(callback.data.split(":")[1])
+    runs = await repo.task_run.get_last_by_task(task_id, TASK_RUNS_COUNT)
+
+    if not runs:
+        return await callback.answer("Задача еще не запускалась.", show_alert=True)
+
+    # Напоминание запускается отдельно для каждого получателя — показываем, для кого
+    recipient_ids = list({run.chat_id for run in runs if run.chat_id is not None})
+    recipients = {user.telegram_id: user for user in await repo.user.get_by_telegram_ids(recipient_ids)}
+
+    lines = [f"🧾 Последние запуски задачи (до {TASK_RUNS_COUNT}):"]
+
+    for run in runs:
+        started_at = run.started_at.astimezone(user_timezone)
+        line = f"{RUN_OUTCOME_ICONS.get(run.outcome, '•')} {started_at:%d.%m.%Y %H:%M}"
+
+        if run.chat_id is not None:
+            recipient = recipients.get(run.chat_id)
+            line += f" · 👤 {html.escape(recipient.username) if recipient and recipient.username else run.chat_id}"
+
+        if run.planned_at is not None:
+            lag = (run.started_at - run.planned_at).total_seconds()
+            line += f" · задержка {lag:.0f} с"
+
+        line += f" · {run.duration_ms} мс"
+
+        if run.amount is not None:
+            line += f" · {run.amount:.2f} ₽"
+
+        if run.error:
+            line += f"\n    {html.escape(run.error)}"
+
+        lines.append(line)
+
+    await callback.message.answer("\n".join(lines))
+    await callback.answer()
+
+
 @router.callback_query(F.data == "add_task")
 async def add_task_start(callback: CallbackQuery, state: FSMContext):
     await state.set_state(AddScheduledTask.choosing_type)
@@ -143,7 +239,8 @@ async def add_task_reminder_text_chosen(
         reminder_text=message.text,
     )
     await state.clear()
-    await reload_scheduler_jobs(bot, session_pool)
+    await repo.commit()
+    request_scheduler_sync(bot, session_pool)
 
     if original_message_id:
         await bot.edit_message_text(
@@ -152,7 +249,7 @@ async def add_task_reminder_text_chosen(
 
 
 @router.message(AddScheduledTask.waiting_for_amount)
-async def add_task_transfer_amount_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def add_task_transfer_amount_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot, user: User):
     try:
         amount = Decimal(message.text.replace(",", "."))
     except InvalidOperation:
@@ -161,7 +258,6 @@ async def add_task_transfer_amount_chosen(message: Message, state: FSMContext, r
 
     await state.update_data(amount=str(amount))  # Сохраняем как строку для JSON
 
-    user = await repo.user.get_or_create(message.from_user.id, message.from_user.username)
     envelopes = await repo.envelope.get_all_active(user.id)
 
     await state.set_state(AddScheduledTask.choosing_envelope_from)
@@ -177,11 +273,10 @@ async def add_task_transfer_amount_chosen(message: Message, state: FSMContext, r
 
 
 @router.callback_query(AddScheduledTask.choosing_envelope_from, F.data.startswith("select_task_from:envelope:"))
-async def add_task_from_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder):
+async def add_task_from_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, user: User):
     from_id = int(callback.data.split(":")[-1])
     await state.update_data(from_envelope_id=from_id)
 
-    user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
     envelopes = await repo.envelope.get_all_active(user.id)
     filtered_envelopes = [env for env in envelopes if env.id != from_id]
 
@@ -210,5 +305,6 @@ async def add_task_to_chosen(
         to_envelope_id=to_id,
     )
     await state.clear()
-    await reload_scheduler_jobs(bot, session_pool)
+    await repo.commit()
+    request_scheduler_sync(bot, session_pool)
     await callback.message.edit_text("✅ Новая задача авто-перевода успешно создана!")
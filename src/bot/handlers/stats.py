@@ -1,30 +1,69 @@
+import datetime as dt
+
 from aiogram import F, Router
-from aiogram.types import InlineKeyboardButton, Message
-from aiogram.utils.keyboard import InlineKeyboardBuilder
+from aiogram.types import CallbackQuery, Message
+from pytz import BaseTzInfo
 
+from src.bot.keyboards import get_stats_month_keyboard, get_stats_year_keyboard
 from src.core.settings import settings
+from src.db.models.user import User
 from src.db.repo_holder import RepoHolder
-from src.services.stats import prepare_current_month_report
+from src.services.stats import get_current_month, prepare_month_report, prepare_year_report, shift_month
 
 router = Router()
 
 
+def _get_metabase_url() -> str | None:
+    """Возвращает ссылку на Metabase, если он настроен на внешний адрес."""
+    if settings.metabase_url and "localhost" not in settings.metabase_url:
+        return settings.metabase_url
+
+    return None
+
+
+async def _render_month_report(repo: RepoHolder, user: User, user_timezone: BaseTzInfo, month: dt.date) -> tuple:
+    """Готовит текст и клавиатуру месячного отчета, не пуская в будущие месяцы."""
+    current_month = get_current_month(user_timezone)
+    month = min(month, current_month)
+    report_text = await prepare_month_report(repo, user, month, user_timezone)
+    next_month = shift_month(month, 1) if month < current_month else None
+    keyboard = get_stats_month_keyboard(month, shift_month(month, -1), next_month, _get_metabase_url())
+
+    return report_text, keyboard
+
+
 @router.message(F.text == "📊 Статистика")
-async def show_stats(message: Message, repo: RepoHolder):
+async def show_stats(message: Message, repo: RepoHolder, user: User, user_timezone: BaseTzInfo):
     """
-    Присылает пользователю отчет за текущий месяц и кнопку
-    для перехода в Metabase.
+    Присылает пользователю отчет за текущий месяц, кнопки навигации
+    по прошлым месяцам и кнопку для перехода в Metabase.
     """
-    user = await repo.user.get_or_create(message.from_user.id, message.from_user.username)
+    report_text, keyboard = await _render_month_report(repo, user, user_timezone, get_current_month(user_timezone))
 
-    # Вызываем сервис, который выполнит все вычисления
-    report_text = await prepare_current_month_report(repo, user)
+    await message.answer(report_text, parse_mode="Markdown", reply_markup=keyboard, disable_web_page_preview=True)
 
-    # Создаем клавиатуру с кнопкой для Metabase, если он настроен
-    builder = InlineKeyboardBuilder()
-    if settings.metabase_url and "localhost" not in settings.metabase_url:
-        builder.row(InlineKeyboardButton(text="Открыть дэшборд", url=settings.metabase_url))
 
-    await message.answer(
-        report_text, parse_mode="Markdown", reply_markup=builder.as_markup(), disable_web_page_preview=True
+@router.callback_query(F.data.startswith("stats:month:"))
+async def show_stats_for_month(callback: CallbackQuery, repo: RepoHolder, user: User, user_timezone: BaseTzInfo):
+    """Показывает отчет за выбранный месяц."""
+    year, month_number = map(int, callback.data.split(":")[2].split("-"))
+    report_text, keyboard = await _render_month_report(repo, user, user_timezone, dt.date(year, month_number, 1))
+
+    await callback.message.edit_text(
+        report_text, parse_mode="Markdown", reply_markup=keyboard, disable_web_page_preview=True
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("stats:year:"))
+async def show_stats_for_year(callback: CallbackQuery, repo: RepoHolder, user: User, user_timezone: BaseTzInfo):
+    """Показывает помесячную сводку за год."""
+    year = int(callback.data.split(":")[2])
+    current_year = get_current_month(user_timezone).year
+    year = min(year, current_year)
+    report_text = await prepare_year_report(repo, user, year)
+
+    await callback.message.edit_text(
+        report_text, parse_mode="Markdown", reply_markup=get_stats_year_keyboard(year, year == current_year)
     )
+    await callback.answer()
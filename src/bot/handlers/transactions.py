@@ -1,23 +1,23 @@
 import datetime as dt
 from decimal import Decimal, InvalidOperation
 
-import pytz
 from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
+from pytz import BaseTzInfo
 
 from src.bot.keyboards import get_items_for_action_keyboard
 from src.bot.states import AddTransaction, MakeTransfer
 from src.db.models.user import User
 from src.db.repo_holder import RepoHolder
+from src.services.income_split import apply_income_split_rules
 
 router = Router()
 
 
-def get_aware_current_date(user: User) -> dt.date:
+def get_aware_current_date(user_timezone: BaseTzInfo) -> dt.date:
     """Получает текущую дату в таймзоне пользователя."""
-    timezone = pytz.timezone(user.timezone)
-    return dt.datetime.now(tz=timezone).date()
+    return dt.datetime.now(tz=user_timezone).date()
 
 
 @router.message(F.text == "📈 Расход")
@@ -61,11 +61,12 @@ async def add_transaction_amount_chosen(message: Message, state: FSMContext, rep
 
 
 @router.callback_query(AddTransaction.choosing_category, F.data.startswith("select:category:"))
-async def add_transaction_category_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def add_transaction_category_chosen(
+    callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot, user: User, user_timezone: BaseTzInfo
+):
     category_id = int(callback.data.split(":")[-1])
     await state.update_data(category_id=category_id)
 
-    user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
     data = await state.get_data()
     trans_type = data.get("trans_type")
     original_message_id = data.get("_original_message_id")
@@ -78,7 +79,9 @@ async def add_transaction_category_chosen(callback: CallbackQuery, state: FSMCon
             await state.clear()
             return
 
-        await _finalize_add_transaction(callback, state, repo, user, income_envelope.id, bot, original_message_id)
+        await _finalize_add_transaction(
+            callback, state, repo, user, user_timezone, income_envelope.id, bot, original_message_id
+        )
         await callback.answer()
     else:
         envelopes = await repo.envelope.get_all_active(user.id)
@@ -93,12 +96,13 @@ async def add_transaction_category_chosen(callback: CallbackQuery, state: FSMCon
 
 
 @router.callback_query(AddTransaction.choosing_envelope, F.data.startswith("select:envelope:"))
-async def add_transaction_envelope_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def add_transaction_envelope_chosen(
+    callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot, user: User, user_timezone: BaseTzInfo
+):
     envelope_id = int(callback.data.split(":")[-1])
-    user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
     data = await state.get_data()
     original_message_id = data.get("_original_message_id")
-    await _finalize_add_transaction(callback, state, repo, user, envelope_id, bot, original_message_id)
+    await _finalize_add_transaction(callback, state, repo, user, user_timezone, envelope_id, bot, original_message_id)
     await callback.answer()
 
 
@@ -107,6 +111,7 @@ async def _finalize_add_transaction(
     state: FSMContext,
     repo: RepoHolder,
     user: User,
+    user_timezone: BaseTzInfo,
     envelope_id: int,
     bot: Bot,
     original_message_id: int
@@ -116,14 +121,19 @@ async def _finalize_add_transaction(
     amount = data.get("amount")
     category_id = data.get("category_id")
 
-    envelope = await repo.envelope.get_by_id(envelope_id)
+    # Строка конверта заблокирована до конца транзакции: параллельная операция с ним подождет
+    envelopes = await repo.envelope.get_by_ids_for_update([envelope_id])
+    envelope = envelopes[0] if envelopes else None
 
     if not envelope:
         await bot.edit_message_text("❌ Ошибка: конверт не найден.", chat_id=callback.message.chat.id, message_id=original_message_id)
         await state.clear()
         return
 
-    if trans_type == "expense" and envelope.balance < amount:
+    # Баланс меняется в БД одним UPDATE; расход не пройдет, если денег на конверте не хватает
+    delta = -amount if trans_type == "expense" else amount
+
+    if await repo.envelope.adjust_balances({envelope_id: delta}) is None:
         current_balance = f"Текущий баланс: {envelope.balance:.2f} ₽."
         await bot.edit_message_text(
             f"❌ Недостаточно средств на конверте «{envelope.name}».\n{current_balance}", 
@@ -134,7 +144,7 @@ async def _finalize_add_transaction(
         await state.clear()
         return
 
-    transaction_date = get_aware_current_date(user)
+    transaction_date = get_aware_current_date(user_timezone)
 
     await repo.transaction.create(
         user_id=user.id,
@@ -144,13 +154,19 @@ async def _finalize_add_transaction(
         transaction_date=transaction_date,
     )
 
-    new_balance = envelope.balance - amount if trans_type == "expense" else envelope.balance + amount
-    await repo.envelope.update(envelope, balance=new_balance)
+    result_text = "✅ Успешно! Операция добавлена."
+
+    if trans_type == "income":
+        # Доход сразу распределяется по правилам — в той же транзакции, что и его запись
+        splits = await apply_income_split_rules(repo, envelope_id, amount)
+
+        if splits:
+            result_text += "\n\n🔀 Распределено по правилам:"
+            for target_envelope, share in splits:
+                result_text += f"\n • {share:.2f} ₽ → «{target_envelope.name}»"
 
     await state.clear()
-    await bot.edit_message_text(
-        "✅ Успешно! Операция добавлена.", chat_id=callback.message.chat.id, message_id=original_message_id
-    )
+    await bot.edit_message_text(result_text, chat_id=callback.message.chat.id, message_id=original_message_id)
 
 
 @router.message(F.text == "📋 Перевод")
@@ -161,7 +177,7 @@ async def make_transfer_start(message: Message, state: FSMContext):
 
 
 @router.message(MakeTransfer.choosing_amount)
-async def make_transfer_amount_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def make_transfer_amount_chosen(message: Message, state: FSMContext, repo: RepoHolder, bot: Bot, user: User):
     try:
         amount = Decimal(message.text.replace(",", "."))
     except InvalidOperation:
@@ -169,7 +185,6 @@ async def make_transfer_amount_chosen(message: Message, state: FSMContext, repo:
         return
 
     await state.update_data(amount=amount)
-    user = await repo.user.get_or_create(message.from_user.id, message.from_user.username)
     envelopes = await repo.envelope.get_all_active(user.id)
     sufficient_balance_envelopes = [env for env in envelopes if env.balance >= amount]
 
@@ -193,11 +208,10 @@ async def make_transfer_amount_chosen(message: Message, state: FSMContext, repo:
 
 
 @router.callback_query(MakeTransfer.choosing_envelope_from, F.data.startswith("from:envelope:"))
-async def make_transfer_from_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def make_transfer_from_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot, user: User):
     envelope_from_id = int(callback.data.split(":")[-1])
     await state.update_data(envelope_from_id=envelope_from_id)
 
-    user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
     envelopes = await repo.envelope.get_all_active(user.id)
     filtered_envelopes = [env for env in envelopes if env.id != envelope_from_id]
 
@@ -215,15 +229,31 @@ async def make_transfer_from_chosen(callback: CallbackQuery, state: FSMContext,
 
 
 @router.callback_query(MakeTransfer.choosing_envelope_to, F.data.startswith("to:envelope:"))
-async def make_transfer_to_chosen(callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot):
+async def make_transfer_to_chosen(
+    callback: CallbackQuery, state: FSMContext, repo: RepoHolder, bot: Bot, user_timezone: BaseTzInfo
+):
     envelope_to_id = int(callback.data.split(":")[-1])
     data = await state.get_data()
     amount = data.get("amount")
     envelope_from_id = data.get("envelope_from_id")
     original_message_id = data.get("_original_message_id")
 
-    env_from = await repo.envelope.get_by_id(envelope_from_id)
-    env_to = await repo.envelope.get_by_id(envelope_to_id)
+    # Диалог уже завершен (например, кнопку нажали повторно) — переводить нечего
+    if amount is None or envelope_from_id is None:
+        await state.clear()
+        await callback.answer()
+        return
+
+    # Клавиатура не предлагает исходный конверт, но устаревшая кнопка или подделанный callback могут
+    if envelope_to_id == envelope_from_id:
+        await callback.answer("❌ Нельзя перевести деньги на тот же конверт.", show_alert=True)
+        return
+
+    envelopes = {
+        env.id: env for env in await repo.envelope.get_by_ids_for_update(sorted({envelope_from_id, envelope_to_id}))
+    }
+    env_from = envelopes.get(envelope_from_id)
+    env_to = envelopes.get(envelope_to_id)
 
     if not env_from or not env_to:
         await bot.edit_message_text(
@@ -232,14 +262,20 @@ async def make_transfer_to_chosen(callback: CallbackQuery, state: FSMContext, re
         await state.clear()
         return
 
-    user = await repo.user.get_or_create(callback.from_user.id, callback.from_user.username)
-    transfer_date = dt.datetime.now(tz=pytz.timezone(user.timezone)).replace(tzinfo=None)
+    transfer_date = dt.datetime.now(tz=user_timezone).replace(tzinfo=None)
+
+    if await repo.envelope.move_balance(env_from.id, env_to.id, amount) is None:
+        await bot.edit_message_text(
+            f"❌ Недостаточно средств на конверте «{env_from.name}» для перевода {amount:.2f} ₽.",
+            chat_id=callback.message.chat.id,
+            message_id=original_message_id,
+        )
+        await state.clear()
+        return
 
     await repo.transfer.create(
         from_envelope_id=env_from.id, to_envelope_id=env_to.id, amount=amount, transfer_date=transfer_date
     )
-    await repo.envelope.update(env_from, balance=env_from.balance - amount)
-    await repo.envelope.update(env_to, balance=env_to.balance + amount)
 
     await state.clear()
     await bot.edit_message_text(
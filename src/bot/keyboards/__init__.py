@@ -5,10 +5,13 @@ from .inline import (
     get_edit_phase_keyboard,
     get_envelopes_manage_menu,
     get_goals_manage_menu,
+    get_income_split_manage_menu,
     get_items_for_action_keyboard,
     get_phases_keyboard,
     get_phases_manage_menu,
     get_scheduler_manage_menu,
+    get_stats_month_keyboard,
+    get_stats_year_keyboard,
     get_task_type_keyboard,
 )
 from .reply import get_main_menu_keyboard
@@ -26,4 +29,7 @@ __all__ = [
     "get_edit_envelope_keyboard",
     "get_scheduler_manage_menu",
     "get_task_type_keyboard",
+    "get_income_split_manage_menu",
+    "get_stats_month_keyboard",
+    "get_stats_year_keyboard",
 ]
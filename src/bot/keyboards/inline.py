@@ -1,3 +1,5 @@
+import datetime as dt
+
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
@@ -76,6 +78,18 @@ def get_scheduler_manage_menu() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+def get_income_split_manage_menu() -> InlineKeyboardMarkup:
+    """Создает меню для управления правилами распределения дохода."""
+    builder = InlineKeyboardBuilder()
+    builder.row(
+        InlineKeyboardButton(text="📋 Список правил", callback_data="list_split_rules"),
+        InlineKeyboardButton(text="➕ Добавить правило", callback_data="add_split_rule"),
+    )
+    builder.row(InlineKeyboardButton(text="⬅️ Назад в меню", callback_data="back_to_main_manage"))
+
+    return builder.as_markup()
+
+
 def get_task_type_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для выбора типа новой задачи."""
     builder = InlineKeyboardBuilder()
@@ -113,6 +127,39 @@ def get_edit_phase_keyboard(phase_id: int) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+def get_stats_month_keyboard(
+    month: dt.date, previous_month: dt.date, next_month: dt.date | None, metabase_url: str | None
+) -> InlineKeyboardMarkup:
+    """Клавиатура навигации по месячным отчетам."""
+    builder = InlineKeyboardBuilder()
+    navigation = [InlineKeyboardButton(text="◀️", callback_data=f"stats:month:{previous_month:%Y-%m}")]
+
+    if next_month:
+        navigation.append(InlineKeyboardButton(text="▶️", callback_data=f"stats:month:{next_month:%Y-%m}"))
+
+    builder.row(*navigation)
+    builder.row(InlineKeyboardButton(text=f"📅 Итоги {month.year} года", callback_data=f"stats:year:{month.year}"))
+
+    if metabase_url:
+        builder.row(InlineKeyboardButton(text="Открыть дэшборд", url=metabase_url))
+
+    return builder.as_markup()
+
+
+def get_stats_year_keyboard(year: int, is_current_year: bool) -> InlineKeyboardMarkup:
+    """Клавиатура навигации по годовым сводкам."""
+    builder = InlineKeyboardBuilder()
+    navigation = [InlineKeyboardButton(text=f"◀️ {year - 1}", callback_data=f"stats:year:{year - 1}")]
+
+    if not is_current_year:
+        navigation.append(InlineKeyboardButton(text=f"{year + 1} ▶️", callback_data=f"stats:year:{year + 1}"))
+
+    builder.row(*navigation)
+    builder.row(InlineKeyboardButton(text="⬅️ К месячному отчету", callback_data=f"stats:month:{year}-12"))
+
+    return builder.as_markup()
+
+
 def get_items_for_action_keyboard(
     items: list[Envelope | Category | Goal | Phase], action: str, entity_type: str
 ) -> InlineKeyboardMarkup:
@@ -1,7 +1,11 @@
 from .auth import AuthMiddleware
+from .fsm_flush import FsmFlushMiddleware
 from .repo import RepoMiddleware
+from .user import UserMiddleware
 
 __all__ = [
     "AuthMiddleware",
+    "FsmFlushMiddleware",
     "RepoMiddleware",
+    "UserMiddleware",
 ]
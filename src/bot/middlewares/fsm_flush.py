@@ -0,0 +1,31 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+from aiogram.types import TelegramObject
+
+from src.bot.fsm_storage import PostgresStorage
+
+
+class FsmFlushMiddleware(BaseMiddleware):
+    """
+    Записывает изменения состояния FSM в БД до окончания обработки апдейта:
+    следующий апдейт чата увидит новое состояние, даже если его получит другой процесс бота.
+    """
+
+    def __init__(self, storage: PostgresStorage) -> None:
+        self.storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        try:
+            return await handler(event, data)
+        finally:
+            state: FSMContext | None = data.get("state")
+
+            if state is not None:
+                await self.storage.flush_key(state.key)
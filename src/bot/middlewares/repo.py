@@ -8,6 +8,7 @@ class RepoMiddleware:
         self.session_pool = session_pool
 
     async def __call__(self, handler, event, data):
-        async with self.session_pool() as session:
-            data["repo"] = RepoHolder(session)
+        # Сессия открывается при первом обращении хендлера к БД; все его записи коммитятся одной транзакцией
+        async with RepoHolder.lazy(self.session_pool) as repo:
+            data["repo"] = repo
             return await handler(event, data)
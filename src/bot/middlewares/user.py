@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from aiogram.types import User as TelegramUser
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.core.report_cache import report_cache
+from src.core.settings import settings
+from src.core.timezones import get_timezone, resolve_timezone
+from src.db.models import User
+from src.db.repo_holder import RepoHolder
+
+
+class UserMiddleware(BaseMiddleware):
+    """
+    Определяет пользователя БД один раз на апдейт и передает хендлерам `user` и `user_timezone`.
+    Пользователи кэшируются в LRU по telegram_id; запись кэша устаревает, как только этот процесс
+    закоммитит любую запись в таблицу users (смена таймзоны, имени и т.п.), а изменения,
+    сделанные другими экземплярами бота, подхватываются по истечении TTL.
+    """
+
+    def __init__(self, max_size: int = settings.user_cache_max_size, ttl: float = settings.user_cache_ttl) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        # telegram_id -> (момент устаревания, версия таблицы users, значения колонок пользователя)
+        self._cache: OrderedDict[int, tuple[float, int, dict[str, Any]]] = OrderedDict()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        from_user: TelegramUser | None = data.get("event_from_user")
+
+        if from_user is None:
+            return await handler(event, data)
+
+        user = await self._get_user(data["repo"], from_user)
+        data["user"] = user
+        data["user_timezone"] = resolve_timezone(user.timezone, get_timezone(settings.default_timezone))
+
+        return await handler(event, data)
+
+    async def _get_user(self, repo: RepoHolder, from_user: TelegramUser) -> User:
+        # Версию фиксируем до чтения: запись, закоммиченная параллельно, не даст закэшировать старые данные
+        version = report_cache.get_version(User.__tablename__)
+        entry = self._cache.get(from_user.id)
+
+        if entry is not None:
+            expires_at, cached_version, values = entry
+
+            if (
+                expires_at > time.monotonic()
+                and cached_version == version
+                and values["username"] == from_user.username
+            ):
+                self._cache.move_to_end(from_user.id)
+                # Собираем пользователя из кэша и привязываем к сессии без SELECT
+                user = User(**values)
+                make_transient_to_detached(user)
+                repo.session.add(user)
+                return user
+
+            del self._cache[from_user.id]
+
+        user = await repo.user.get_or_create(from_user.id, from_user.username)
+
+        if user.username != from_user.username:
+            # Запись в users сама поднимет версию после коммита, кэшировать нечего
+            return await repo.user.update(user, username=from_user.username)
+
+        column_keys = [attr.key for attr in inspect(User).column_attrs]
+
+        # Только что созданный пользователь еще не закоммичен и загружен не полностью — его не кэшируем
+        if inspect(user).unloaded.isdisjoint(column_keys):
+            values = {key: getattr(user, key) for key in column_keys}
+            self._cache[from_user.id] = (time.monotonic() + self.ttl, version, values)
+
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+        return user
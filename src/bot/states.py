@@ -75,5 +75,11 @@ class AddScheduledTask(StatesGroup):
     choosing_envelope_to = State()
 
 
+class AddIncomeSplitRule(StatesGroup):
+    choosing_source = State()
+    choosing_target = State()
+    waiting_for_percent = State()
+
+
 class CommonStates(StatesGroup):
     waiting_for_timezone = State()
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import signal
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from urllib.parse import urlsplit
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.methods import TelegramMethod
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from src.core.settings import settings
+
+
+class LimitedRequestHandler(SimpleRequestHandler):
+    """
+    Отвечает Telegram сразу после проверки секрета, а апдейт обрабатывает в фоне.
+    Одновременно обрабатывается не больше max_concurrent_updates апдейтов, остальные ждут очереди.
+    Апдейты одного чата стоят в очереди чата, не занимая общий лимит, поэтому
+    поток апдейтов из одного чата не задерживает остальные.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, secret_token: str, max_concurrent_updates: int, **data: Any):
+        super().__init__(dispatcher, bot, handle_in_background=True, secret_token=secret_token, **data)
+        self._semaphore = asyncio.Semaphore(max_concurrent_updates)
+        self._chat_locks: dict[int, asyncio.Lock] = {}
+        self._chat_waiters: dict[int, int] = {}  # сколько апдейтов чата сейчас обрабатывается или ждет очереди
+
+    async def _background_feed_update(self, bot: Bot, update: dict[str, Any]) -> None:
+        parsed_update = Update.model_validate(update, context={"bot": bot})
+        event_context = UserContextMiddleware.resolve_event_context(parsed_update)
+        chat_id = event_context.chat_id or event_context.user_id
+
+        async with self._chat_lock(chat_id), self._semaphore:
+            result = await self.dispatcher.feed_update(bot, parsed_update, **self.data)
+
+        if isinstance(result, TelegramMethod):
+            await self.dispatcher.silent_call_request(bot=bot, result=result)
+
+    @asynccontextmanager
+    async def _chat_lock(self, chat_id: int | None) -> AsyncIterator[None]:
+        if chat_id is None:
+            yield
+            return
+
+        lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        self._chat_waiters[chat_id] = self._chat_waiters.get(chat_id, 0) + 1
+
+        try:
+            # asyncio.Lock пропускает ожидающих в порядке очереди
+            async with lock:
+                yield
+        finally:
+            self._chat_waiters[chat_id] -= 1
+
+            if not self._chat_waiters[chat_id]:
+                del self._chat_waiters[chat_id]
+                del self._chat_locks[chat_id]
+
+    async def close(self) -> None:
+        # Уже принятые апдейты дообрабатываем до закрытия сессии бота
+        await asyncio.gather(*self._background_feed_update_tasks, return_exceptions=True)
+        await super().close()
+
+
+def get_webhook_path() -> str:
+    """Путь, на котором aiohttp принимает апдейты: совпадает с путем из WEBHOOK_URL."""
+    return urlsplit(settings.webhook_url).path or "/"
+
+
+def create_webhook_app(
+    dp: Dispatcher, bot: Bot, path: str, secret_token: str, max_concurrent_updates: int
+) -> web.Application:
+    """aiohttp-приложение, принимающее апдейты Telegram на path."""
+    app = web.Application()
+    LimitedRequestHandler(dp, bot, secret_token, max_concurrent_updates).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """
+    Поднимает встроенный веб-сервер и регистрирует вебхук. Накопившиеся за время
+    перезапуска апдейты не сбрасываются: Telegram доставит их, как только сервер поднимется.
+    """
+    app = create_webhook_app(
+        dp, bot, get_webhook_path(), settings.webhook_secret, settings.webhook_max_concurrent_updates
+    )
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await web.TCPSite(runner, settings.webhook_host, settings.webhook_port).start()
+        await bot.set_webhook(
+            settings.webhook_url,
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+            drop_pending_updates=False,
+        )
+        logging.info(f"Вебхук слушает {settings.webhook_host}:{settings.webhook_port}{get_webhook_path()}")
+
+        await stop_event.wait()
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+
+        # Вебхук не удаляем: пока бот перезапускается, Telegram копит апдейты у себя
+        await runner.cleanup()
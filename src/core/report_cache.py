@@ -0,0 +1,86 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from src.core.settings import settings
+
+# От каких таблиц зависит каждый вид отчета: запись в любую из них делает отчет устаревшим
+REPORT_DEPENDENCIES = {
+    "stats": ("transactions", "transfers", "envelopes", "users"),
+    "year": ("transactions", "transfers", "envelopes"),
+    "quest": ("transfers", "envelopes", "goals", "phases", "system_state"),
+}
+
+
+class ReportCache:
+    """
+    LRU-кэш готовых отчетов с TTL. Ключ — (пользователь, месяц, вид отчета).
+    Репозитории поднимают версию таблицы при каждой записи; запись кэша хранит
+    версии таблиц, из которых построен отчет, и становится промахом, если любая из них изменилась.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._versions: dict[str, int] = {}
+        self._entries: OrderedDict[tuple, tuple[float, tuple[int, ...], Any]] = OrderedDict()
+
+    def bump_version(self, table_name: str) -> None:
+        """Отмечает изменение таблицы, инвалидируя зависящие от нее отчеты."""
+        self._versions[table_name] = self._versions.get(table_name, 0) + 1
+
+    def get_version(self, table_name: str) -> int:
+        """Текущая версия таблицы: меняется после коммита любой записи в нее."""
+        return self._versions.get(table_name, 0)
+
+    def _snapshot(self, kind: str) -> tuple[int, ...]:
+        return tuple(self._versions.get(table, 0) for table in REPORT_DEPENDENCIES[kind])
+
+    def get(self, kind: str, user_id: int, month: Hashable) -> Any | None:
+        key = (user_id, month, kind)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            expires_at, versions, value = entry
+
+            if expires_at > time.monotonic() and versions == self._snapshot(kind):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logging.info(f"Кэш отчетов: попадание {key} (hits={self.hits}, misses={self.misses})")
+                return value
+
+            del self._entries[key]
+
+        self.misses += 1
+        logging.info(f"Кэш отчетов: промах {key} (hits={self.hits}, misses={self.misses})")
+        return None
+
+    def set(self, kind: str, user_id: int, month: Hashable, value: Any, versions: tuple[int, ...]) -> None:
+        key = (user_id, month, kind)
+        self._entries[key] = (time.monotonic() + self.ttl, versions, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_build(
+        self, kind: str, user_id: int, month: Hashable, builder: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Возвращает отчет из кэша или строит его и кладет в кэш."""
+        cached = self.get(kind, user_id, month)
+
+        if cached is not None:
+            return cached
+
+        # Версии фиксируем до построения: запись, пришедшая во время расчета, не даст закэшировать старый отчет
+        versions = self._snapshot(kind)
+        value = await builder()
+        self.set(kind, user_id, month, value, versions)
+
+        return value
+
+
+report_cache = ReportCache(max_size=settings.report_cache_max_size, ttl=settings.report_cache_ttl)
@@ -1,4 +1,5 @@
 import urllib
+from typing import Literal
 
 from pydantic import PostgresDsn, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -18,6 +19,14 @@ class Settings(BaseSettings):
     user_2_telegram_id: int
     user_2_username: str
 
+    # --- Получение апдейтов: long polling или вебхук ---
+    bot_mode: Literal["polling", "webhook"] = "polling"
+    webhook_url: str | None = None  # публичный HTTPS-адрес вебхука, например https://example.com/telegram/webhook
+    webhook_secret: str | None = None  # сверяется с заголовком X-Telegram-Bot-Api-Secret-Token
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+    webhook_max_concurrent_updates: int = 16  # сколько апдейтов обрабатывается одновременно
+
     # --- DB connection parts ---
     postgres_user: str
     postgres_password: str
@@ -26,11 +35,52 @@ class Settings(BaseSettings):
     postgres_port: int = 5432
     database_url: PostgresDsn | None = None
 
+    # --- DB connection pool ---
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_timeout: int = 30  # секунды ожидания свободного соединения
+    db_pool_recycle: int = 1800  # секунды жизни соединения
+    db_echo: bool = False
+
     # --- DB connection parts ---
     metabase_url: str | None = None
 
     default_timezone: str = "Asia/Tomsk"
 
+    # --- Scheduler ---
+    scheduler_misfire_grace_time: int = 86400  # секунды: насколько поздно еще можно выполнить пропущенный запуск
+    scheduler_coalesce: bool = True  # несколько пропущенных запусков одной задачи выполняются один раз
+    scheduler_sync_debounce: float = 1.0  # секунды: изменения задач за это время сливаются в одну синхронизацию
+    scheduler_resync_interval: int = 60  # секунды: ведущий периодически сверяет джобы с задачами в БД
+    scheduler_leader_interval: float = 5.0  # секунды: проверка блокировки ведущим и попытки резервных ее захватить
+
+    # --- Notifications (лимиты Telegram: ~30 сообщений/с всего и ~1 сообщение/с в один чат) ---
+    notification_global_rate: float = 30.0
+    notification_per_chat_rate: float = 1.0
+    notification_max_attempts: int = 5
+    notification_ttl: int = 86400  # секунды: более старые неотправленные уведомления после рестарта не шлем
+
+    # --- Report cache ---
+    report_cache_max_size: int = 256
+    report_cache_ttl: int = 300  # секунды
+
+    # --- User cache ---
+    user_cache_max_size: int = 64
+    user_cache_ttl: int = 60  # секунды: за это время подтягиваются изменения, сделанные другими экземплярами бота
+
+    # --- FSM storage (состояния диалогов в Postgres) ---
+    fsm_state_ttl: int = 86400  # секунды: незавершенный диалог старше этого считается брошенным
+    fsm_cache_max_size: int = 1024  # сколько состояний держать в памяти
+    fsm_cleanup_interval: int = 3600  # секунды: как часто удалять брошенные состояния из БД
+
+    @model_validator(mode="after")
+    def check_webhook(self) -> "Settings":
+        """В режиме вебхука нужны его адрес и секретный токен."""
+        if self.bot_mode == "webhook" and not (self.webhook_url and self.webhook_secret):
+            raise ValueError("Для BOT_MODE=webhook нужно задать WEBHOOK_URL и WEBHOOK_SECRET.")
+
+        return self
+
     @model_validator(mode="after")
     def assemble_db_connection(self) -> "Settings":
         """Assembles the database_url from its parts."""
@@ -0,0 +1,26 @@
+import logging
+from functools import lru_cache
+
+import pytz
+
+
+@lru_cache(maxsize=64)
+def get_timezone(name: str) -> pytz.BaseTzInfo:
+    """
+    Возвращает объект таймзоны по названию, кэшируя его: таймзоны пользователей
+    нужны почти на каждый апдейт и при каждой синхронизации планировщика.
+    Для неизвестного названия бросает pytz.UnknownTimeZoneError (ошибки не кэшируются).
+    """
+    return pytz.timezone(name)
+
+
+def resolve_timezone(name: str | None, default: pytz.BaseTzInfo) -> pytz.BaseTzInfo:
+    """Таймзона по названию из БД; пустое или неизвестное название заменяется на default."""
+    if not name:
+        return default
+
+    try:
+        return get_timezone(name)
+    except pytz.UnknownTimeZoneError:
+        logging.warning(f"Неизвестная таймзона '{name}', используем {default}.")
+        return default
@@ -0,0 +1,19 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+# Ключи advisory-блокировок Postgres в двухаргументной форме (пространство, ключ).
+# Пространства выбраны так, чтобы не пересекаться с другими приложениями на том же сервере.
+MIGRATIONS_LOCK = (746_101, 0)
+SCHEDULER_LEADER_LOCK = (746_102, 0)
+# Второй аргумент — ID задачи планировщика
+TASK_RUN_LOCK_SPACE = 746_103
+
+
+async def try_advisory_lock(conn: AsyncConnection, lock: tuple[int, int]) -> bool:
+    """Сессионная блокировка: держится, пока открыто соединение или до pg_advisory_unlock."""
+    return await conn.scalar(select(func.pg_try_advisory_lock(*lock)))
+
+
+async def try_advisory_xact_lock(session: AsyncSession | AsyncConnection, lock: tuple[int, int]) -> bool:
+    """Транзакционная блокировка: снимается сама при коммите или откате."""
+    return await session.scalar(select(func.pg_try_advisory_xact_lock(*lock)))
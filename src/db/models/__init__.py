@@ -1,9 +1,15 @@
 from .base import Base
 from .category import Category
 from .envelope import Envelope
+from .fsm_state import FsmState
 from .goal import Goal
+from .income_split_rule import IncomeSplitRule
+from .monthly_rollup import MonthlyRollup
+from .notification_outbox import NotificationOutbox
 from .phase import Phase
 from .scheduled_task import ScheduledTask
+from .scheduled_task_execution import ScheduledTaskExecution
+from .scheduled_task_run import ScheduledTaskRun
 from .system_state import SystemState
 from .transaction import Transaction
 from .transfer import Transfer
@@ -20,4 +26,10 @@ __all__ = [
     "Phase",
     "SystemState",
     "ScheduledTask",
+    "MonthlyRollup",
+    "ScheduledTaskExecution",
+    "NotificationOutbox",
+    "ScheduledTaskRun",
+    "IncomeSplitRule",
+    "FsmState",
 ]
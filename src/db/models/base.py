@@ -2,4 +2,8 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class Base(DeclarativeBase):
+    # Серверные значения по умолчанию забираем через RETURNING при flush:
+    # внутри единицы работы объекты не перечитываются отдельным SELECT после коммита.
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -0,0 +1,20 @@
+import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class FsmState(Base):
+    """
+    Состояние диалога (FSM aiogram) пользователя в чате. Данные хранятся JSON-строкой;
+    состояние старше TTL считается брошенным и удаляется.
+    """
+
+    __tablename__ = "fsm_states"
+
+    key: Mapped[str] = mapped_column(String, unique=True, index=True)  # ключ aiogram: бот, чат, пользователь
+    state: Mapped[str | None]
+    data: Mapped[str] = mapped_column(String, default="{}")
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -0,0 +1,24 @@
+from decimal import Decimal
+
+from sqlalchemy import (
+    Boolean,
+    ForeignKey,
+    Numeric,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class IncomeSplitRule(Base):
+    """
+    Правило распределения дохода: когда доход зачисляется на source-конверт,
+    percent процентов от него сразу переводится на target-конверт.
+    """
+
+    __tablename__ = "income_split_rules"
+
+    source_envelope_id: Mapped[int] = mapped_column(ForeignKey("envelopes.id"), index=True)
+    target_envelope_id: Mapped[int] = mapped_column(ForeignKey("envelopes.id"))
+    percent: Mapped[Decimal] = mapped_column(Numeric)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -0,0 +1,42 @@
+import datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    Date,
+    ForeignKey,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MonthlyRollup(Base):
+    """
+    Помесячный агрегат движения денег по конверту, категории и пользователю.
+    Обновляется в той же транзакции, что и запись в transactions/transfers.
+    """
+
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "month",
+            "envelope_id",
+            "category_id",
+            "user_id",
+            "direction",
+            name="uq_monthly_rollups_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    month: Mapped[datetime.date] = mapped_column(Date)  # первое число месяца
+    envelope_id: Mapped[int] = mapped_column(ForeignKey("envelopes.id"))
+    category_id: Mapped[int | None] = mapped_column(ForeignKey("categories.id"))  # None для переводов
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"))  # None для переводов
+    direction: Mapped[str] = mapped_column(String)  # income, expense, transfer_in, transfer_out
+    amount: Mapped[Decimal] = mapped_column(Numeric, default=0)
+    operations_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,32 @@
+import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class NotificationOutbox(Base):
+    """
+    Исходящее уведомление в Telegram. Запись создается до отправки (для авто-перевода —
+    в той же транзакции, что и перевод), поэтому неотправленное переживает перезапуск.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (Index("ix_notification_outbox_status_created_at", "status", "created_at"),)
+
+    chat_id: Mapped[int] = mapped_column(BigInteger)
+    text: Mapped[str] = mapped_column(String)
+    parse_mode: Mapped[str | None]  # None — parse_mode бота по умолчанию
+    status: Mapped[str] = mapped_column(String, default="pending")  # pending, sent, failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None]
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
+    sent_at: Mapped[datetime.datetime | None] = mapped_column(DateTime)
@@ -0,0 +1,31 @@
+import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ScheduledTaskExecution(Base):
+    """
+    Отметка о выполнении запуска задачи планировщика (ключ идемпотентности).
+    Пишется в той же транзакции, что и сам авто-перевод, поэтому повтор не переведет деньги дважды.
+    """
+
+    __tablename__ = "scheduled_task_executions"
+    __table_args__ = (
+        UniqueConstraint("task_id", "period", "chat_id", name="uq_scheduled_task_executions_task_period_chat"),
+    )
+
+    task_id: Mapped[int] = mapped_column(ForeignKey("scheduled_tasks.id", ondelete="CASCADE"))
+    period: Mapped[datetime.date] = mapped_column(Date)  # дата запуска по расписанию (с учетом переноса)
+    # Получатель напоминания: у каждого пользователя свой джоб в его таймзоне; 0 — запуск общий (авто-перевод)
+    chat_id: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    executed_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
@@ -0,0 +1,34 @@
+import datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ScheduledTaskRun(Base):
+    """
+    Журнал запусков задач планировщика: когда запуск был запланирован, когда начался,
+    сколько длился и чем закончился. Время хранится с таймзоной, чтобы считать задержку.
+    """
+
+    __tablename__ = "scheduled_task_runs"
+    __table_args__ = (Index("ix_scheduled_task_runs_task_id_started_at", "task_id", "started_at"),)
+
+    task_id: Mapped[int] = mapped_column(ForeignKey("scheduled_tasks.id", ondelete="CASCADE"))
+    planned_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    duration_ms: Mapped[int] = mapped_column(Integer)
+    outcome: Mapped[str] = mapped_column(String)  # success, insufficient_funds, skipped, locked, error
+    amount: Mapped[Decimal | None] = mapped_column(Numeric)  # сколько денег перемещено
+    error: Mapped[str | None]
+    chat_id: Mapped[int | None] = mapped_column(BigInteger)  # получатель напоминания; None для авто-переводов
@@ -6,6 +6,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     func,
 )
@@ -21,8 +22,14 @@ if TYPE_CHECKING:
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # Отчеты выбирают транзакции конверта/пользователя за период
+    __table_args__ = (
+        Index("ix_transactions_envelope_id_transaction_date", "envelope_id", "transaction_date"),
+        Index("ix_transactions_user_id_transaction_date", "user_id", "transaction_date"),
+    )
+
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"))
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), index=True)
     envelope_id: Mapped[int] = mapped_column(ForeignKey("envelopes.id"))
     amount: Mapped[Decimal] = mapped_column(Numeric)
     transaction_date: Mapped[datetime.date] = mapped_column(Date)
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import (
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     func,
 )
@@ -18,6 +19,12 @@ if TYPE_CHECKING:
 
 class Transfer(Base):
     __tablename__ = "transfers"
+    # Отчеты выбирают переводы в конверт/из конверта за период
+    __table_args__ = (
+        Index("ix_transfers_to_envelope_id_transfer_date", "to_envelope_id", "transfer_date"),
+        Index("ix_transfers_from_envelope_id_transfer_date", "from_envelope_id", "transfer_date"),
+    )
+
     from_envelope_id: Mapped[int] = mapped_column(ForeignKey("envelopes.id"))
     to_envelope_id: Mapped[int] = mapped_column(ForeignKey("envelopes.id"))
     amount: Mapped[Decimal] = mapped_column(Numeric)
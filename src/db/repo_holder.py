@@ -1,29 +1,134 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
+from functools import cached_property
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.db.repositories import (
     CategoryRepository,
     EnvelopeRepository,
+    FsmStateRepository,
     GoalRepository,
+    IncomeSplitRuleRepository,
+    MonthlyRollupRepository,
+    NotificationOutboxRepository,
     PhaseRepository,
+    ScheduledTaskExecutionRepository,
     ScheduledTaskRepository,
+    ScheduledTaskRunRepository,
     SystemStateRepository,
     TransactionRepository,
     TransferRepository,
     UserRepository,
 )
+from src.db.unit_of_work import begin_unit_of_work, commit, rollback
 
 
 class RepoHolder:
-    """Этот класс содержит все репозитории для удобной передачи в хендлеры."""
-
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
-        self.user = UserRepository(session)
-        self.envelope = EnvelopeRepository(session)
-        self.category = CategoryRepository(session)
-        self.transaction = TransactionRepository(session)
-        self.transfer = TransferRepository(session)
-        self.phase = PhaseRepository(session)
-        self.goal = GoalRepository(session)
-        self.state = SystemStateRepository(session)
-        self.scheduled_task = ScheduledTaskRepository(session)
+    """
+    Этот класс содержит все репозитории для удобной передачи в хендлеры.
+    Репозитории создаются при первом обращении; в ленивом режиме (см. lazy) так же
+    открывается и сессия, поэтому апдейты, не работающие с БД, не занимают соединение из пула.
+    """
+
+    def __init__(self, session: AsyncSession | None = None, session_pool: async_sessionmaker | None = None) -> None:
+        self._session = session
+        self._session_pool = session_pool
+
+    @classmethod
+    @asynccontextmanager
+    async def lazy(cls, session_pool: async_sessionmaker) -> AsyncIterator["RepoHolder"]:
+        """
+        RepoHolder, открывающий сессию с единицей работы при первом обращении к ней.
+        На выходе единица работы коммитится (или откатывается при исключении), только если сессия была открыта.
+        """
+        repo = cls(session_pool=session_pool)
+
+        try:
+            yield repo
+        except BaseException:
+            if repo._session is not None:
+                await rollback(repo._session)
+            raise
+        else:
+            if repo._session is not None:
+                await commit(repo._session)
+        finally:
+            if repo._session is not None:
+                await repo._session.close()
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_pool()
+            begin_unit_of_work(self._session)
+
+        return self._session
+
+    @cached_property
+    def user(self) -> UserRepository:
+        return UserRepository(self.session)
+
+    @cached_property
+    def envelope(self) -> EnvelopeRepository:
+        return EnvelopeRepository(self.session)
+
+    @cached_property
+    def category(self) -> CategoryRepository:
+        return CategoryRepository(self.session)
+
+    @cached_property
+    def transaction(self) -> TransactionRepository:
+        return TransactionRepository(self.session)
+
+    @cached_property
+    def transfer(self) -> TransferRepository:
+        return TransferRepository(self.session)
+
+    @cached_property
+    def phase(self) -> PhaseRepository:
+        return PhaseRepository(self.session)
+
+    @cached_property
+    def goal(self) -> GoalRepository:
+        return GoalRepository(self.session)
+
+    @cached_property
+    def state(self) -> SystemStateRepository:
+        return SystemStateRepository(self.session)
+
+    @cached_property
+    def scheduled_task(self) -> ScheduledTaskRepository:
+        return ScheduledTaskRepository(self.session)
+
+    @cached_property
+    def monthly_rollup(self) -> MonthlyRollupRepository:
+        return MonthlyRollupRepository(self.session)
+
+    @cached_property
+    def task_execution(self) -> ScheduledTaskExecutionRepository:
+        return ScheduledTaskExecutionRepository(self.session)
+
+    @cached_property
+    def notification_outbox(self) -> NotificationOutboxRepository:
+        return NotificationOutboxRepository(self.session)
+
+    @cached_property
+    def task_run(self) -> ScheduledTaskRunRepository:
+        return ScheduledTaskRunRepository(self.session)
+
+    @cached_property
+    def income_split_rule(self) -> IncomeSplitRuleRepository:
+        return IncomeSplitRuleRepository(self.session)
+
+    @cached_property
+    def fsm_state(self) -> FsmStateRepository:
+        return FsmStateRepository(self.session)
+
+    async def commit(self) -> None:
+        """
+        Досрочно коммитит единицу работы. Нужен, когда результат должен увидеть
+        другая сессия (например, перезагрузка планировщика) еще до конца обработки апдейта.
+        """
+        if self._session is not None:
+            await commit(self._session)
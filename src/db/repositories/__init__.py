@@ -1,9 +1,15 @@
 from .base import BaseRepository
 from .category import CategoryRepository
 from .envelope import EnvelopeRepository
+from .fsm_state import FsmStateRepository
 from .goal import GoalRepository
+from .income_split_rule import IncomeSplitRuleRepository
+from .monthly_rollup import MonthlyRollupRepository
+from .notification_outbox import NotificationOutboxRepository
 from .phase import PhaseRepository
 from .scheduled_task import ScheduledTaskRepository
+from .scheduled_task_execution import ScheduledTaskExecutionRepository
+from .scheduled_task_run import ScheduledTaskRunRepository
 from .system_state import SystemStateRepository
 from .transaction import TransactionRepository
 from .transfer import TransferRepository
@@ -20,4 +26,10 @@ __all__ = [
     "GoalRepository",
     "SystemStateRepository",
     "ScheduledTaskRepository",
+    "MonthlyRollupRepository",
+    "ScheduledTaskExecutionRepository",
+    "NotificationOutboxRepository",
+    "ScheduledTaskRunRepository",
+    "IncomeSplitRuleRepository",
+    "FsmStateRepository",
 ]
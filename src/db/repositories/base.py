@@ -4,12 +4,17 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import Base
+from src.db.unit_of_work import in_unit_of_work, mark_changed
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
 class BaseRepository(Generic[ModelType]):
-    """Базовый класс для всех репозиториев, содержит CRUD операции."""
+    """
+    Базовый класс для всех репозиториев, содержит CRUD операции.
+    Без единицы работы каждая запись коммитится сразу (режим для скриптов);
+    внутри unit_of_work запись только сбрасывается в БД через flush.
+    """
 
     def __init__(self, model: Type[ModelType], session: AsyncSession) -> None:
         self.model = model
@@ -27,9 +32,8 @@ class BaseRepository(Generic[ModelType]):
     async def create(self, **data) -> ModelType:
         instance = self.model(**data)
         self.session.add(instance)
-
-        await self.session.commit()
-        await self.session.refresh(instance)
+        await self._on_create(instance)
+        await self._save(instance)
 
         return instance
 
@@ -37,11 +41,29 @@ class BaseRepository(Generic[ModelType]):
         for key, value in data.items():
             setattr(instance, key, value)
 
-        await self.session.commit()
-        await self.session.refresh(instance)
+        await self._save(instance)
 
         return instance
 
     async def delete(self, instance: ModelType) -> None:
         await self.session.delete(instance)
-        await self.session.commit()
+        await self._save()
+
+    async def _save(self, instance: ModelType | None = None) -> None:
+        """Коммитит изменения или, внутри единицы работы, только делает flush."""
+        if in_unit_of_work(self.session):
+            await self.session.flush()
+        else:
+            await self.session.commit()
+
+            if instance is not None:
+                await self.session.refresh(instance)
+
+        self._mark_changed()
+
+    def _mark_changed(self) -> None:
+        """Сообщает кэшу отчетов, что данные таблицы изменились."""
+        mark_changed(self.session, self.model.__tablename__)
+
+    async def _on_create(self, instance: ModelType) -> None:
+        """Хук для связанных записей, которые должны попасть в ту же транзакцию, что и instance."""
@@ -1,6 +1,9 @@
-from sqlalchemy import select
+from decimal import Decimal
+
+from sqlalchemy import case, or_, select, update
 
 from src.db.models import Envelope
+from src.db.unit_of_work import in_unit_of_work
 
 from .base import BaseRepository
 
@@ -32,3 +35,62 @@ class EnvelopeRepository(BaseRepository[Envelope]):
         stmt = select(self.model).where(self.model.name == name)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def get_by_ids_for_update(self, envelope_ids: list[int]) -> list[Envelope]:
+        """
+        Загружает конверты и блокирует их строки до конца транзакции (SELECT ... FOR UPDATE).
+        Блокировки берутся в порядке id, поэтому параллельные транзакции не уходят во взаимную блокировку.
+        """
+        stmt = (
+            select(self.model)
+            .where(self.model.id.in_(envelope_ids))
+            .order_by(self.model.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def adjust_balances(self, deltas: dict[int, Decimal]) -> list[Envelope] | None:
+        """
+        Атомарно меняет балансы конвертов одним UPDATE ... SET balance = balance + delta RETURNING.
+        Списание не может увести баланс в минус: если хоть один конверт не прошел проверку,
+        изменения отменяются и возвращается None. Без единицы работы изменения коммитятся сразу.
+        """
+        updated = await self._apply_deltas(deltas, guard=True)
+
+        if len(updated) != len(deltas):
+            if in_unit_of_work(self.session):
+                # Строки уже заблокированы нами до конца транзакции, поэтому обратный сдвиг точен
+                await self._apply_deltas({env.id: -deltas[env.id] for env in updated}, guard=False)
+            else:
+                await self.session.rollback()
+            return None
+
+        await self._save()
+        return updated
+
+    async def move_balance(self, from_envelope_id: int, to_envelope_id: int, amount: Decimal) -> list[Envelope] | None:
+        """
+        Переводит amount с одного конверта на другой через adjust_balances (None — не хватает средств).
+        Перевод конверта на самого себя — ошибка вызывающего кода: такой перевод создал бы деньги.
+        """
+        if from_envelope_id == to_envelope_id:
+            raise ValueError(f"Перевод с конверта ID:{from_envelope_id} на него же")
+
+        return await self.adjust_balances({from_envelope_id: -amount, to_envelope_id: amount})
+
+    async def _apply_deltas(self, deltas: dict[int, Decimal], guard: bool) -> list[Envelope]:
+        if not deltas:
+            return []
+
+        delta = case(deltas, value=self.model.id)
+        stmt = update(self.model).where(self.model.id.in_(deltas)).values(balance=self.model.balance + delta)
+
+        if guard:
+            stmt = stmt.where(or_(delta >= 0, self.model.balance + delta >= 0))
+
+        stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+        result = await self.session.execute(stmt)
+
+        return list(result.scalars().all())
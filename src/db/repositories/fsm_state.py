@@ -0,0 +1,53 @@
+import datetime as dt
+
+from sqlalchemy import String, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from src.db.models import FsmState
+from src.db.repositories.base import BaseRepository
+
+# Канал LISTEN/NOTIFY, в который пишутся ключи измененных состояний
+FSM_STATES_CHANNEL = "fsm_states"
+
+
+class FsmStateRepository(BaseRepository[FsmState]):
+    """Репозиторий состояний диалогов FSM."""
+
+    def __init__(self, session):
+        super().__init__(FsmState, session)
+
+    async def get_by_key(self, key: str, updated_since: dt.datetime) -> FsmState | None:
+        """Возвращает состояние по ключу, если оно менялось не раньше updated_since."""
+        stmt = select(self.model).where(self.model.key == key, self.model.updated_at >= updated_since)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def upsert_many(self, rows: list[dict]) -> None:
+        """
+        Записывает состояния одним INSERT ... ON CONFLICT. Строки сортируются по ключу,
+        чтобы параллельные записи из разных процессов не взаимоблокировались.
+        """
+        if not rows:
+            return
+
+        stmt = insert(self.model.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.key],
+            set_={"state": stmt.excluded.state, "data": stmt.excluded.data, "updated_at": stmt.excluded.updated_at},
+        )
+        await self.session.execute(stmt, sorted(rows, key=lambda row: row["key"]))
+
+    async def delete_by_keys(self, keys: list[str]) -> None:
+        if keys:
+            await self.session.execute(delete(self.model).where(self.model.key.in_(keys)))
+
+    async def delete_expired(self, updated_before: dt.datetime) -> int:
+        """Удаляет брошенные состояния, не менявшиеся с updated_before."""
+        result = await self.session.execute(delete(self.model).where(self.model.updated_at < updated_before))
+        return result.rowcount
+
+    async def notify_changed(self, payloads: list[str]) -> None:
+        """Рассылает другим процессам ключи измененных состояний; уходит только при коммите транзакции."""
+        if payloads:
+            stmt = select(func.pg_notify(FSM_STATES_CHANNEL, func.unnest(literal(payloads, ARRAY(String)))))
+            await self.session.execute(stmt)
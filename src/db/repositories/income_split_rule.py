@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from src.db.models import Envelope, IncomeSplitRule
+
+from .base import BaseRepository
+
+
+class IncomeSplitRuleRepository(BaseRepository[IncomeSplitRule]):
+    """Репозиторий правил распределения дохода."""
+
+    def __init__(self, session) -> None:
+        super().__init__(IncomeSplitRule, session)
+
+    async def get_active_by_source(self, source_envelope_id: int) -> list[IncomeSplitRule]:
+        """
+        Активные правила для конверта, на который зачисляется доход, в порядке создания.
+        Правила с архивированным конвертом-получателем пропускаются.
+        """
+        stmt = (
+            select(self.model)
+            .join(Envelope, self.model.target_envelope_id == Envelope.id)
+            .where(
+                self.model.source_envelope_id == source_envelope_id,
+                self.model.is_active.is_(True),
+                Envelope.is_active.is_(True),
+            )
+            .order_by(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_all_ordered(self) -> list[IncomeSplitRule]:
+        """Все правила, сгруппированные по конверту-источнику (для списка)."""
+        stmt = select(self.model).order_by(self.model.source_envelope_id, self.model.id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_active_percent_total(self, source_envelope_id: int) -> Decimal:
+        """Сумма процентов активных правил конверта-источника."""
+        stmt = select(func.sum(self.model.percent)).where(
+            self.model.source_envelope_id == source_envelope_id, self.model.is_active.is_(True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() or Decimal(0)
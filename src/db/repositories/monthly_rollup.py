@@ -0,0 +1,159 @@
+import datetime as dt
+from decimal import Decimal
+
+from sqlalchemy import Row, case, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.db.models import Envelope, MonthlyRollup, Transaction, Transfer
+from src.db.repositories.base import BaseRepository
+
+TRANSFER_IN = "transfer_in"
+TRANSFER_OUT = "transfer_out"
+
+
+def month_start(date_obj: dt.date) -> dt.date:
+    """Возвращает первое число месяца для даты (или datetime)."""
+    if isinstance(date_obj, dt.datetime):
+        date_obj = date_obj.date()
+
+    return date_obj.replace(day=1)
+
+
+class MonthlyRollupRepository(BaseRepository[MonthlyRollup]):
+    """Репозиторий помесячных агрегатов по конвертам, категориям и пользователям."""
+
+    def __init__(self, session):
+        super().__init__(MonthlyRollup, session)
+
+    async def add(
+        self,
+        month: dt.date,
+        envelope_id: int,
+        direction: str,
+        amount: Decimal,
+        category_id: int | None = None,
+        user_id: int | None = None,
+    ) -> None:
+        """
+        Прибавляет сумму к агрегату (upsert). Не коммитит: вызывается внутри
+        транзакции, в которой создается сама операция.
+        """
+        stmt = insert(self.model).values(
+            month=month,
+            envelope_id=envelope_id,
+            category_id=category_id,
+            user_id=user_id,
+            direction=direction,
+            amount=amount,
+            operations_count=1,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_monthly_rollups_key",
+            set_={
+                "amount": self.model.amount + stmt.excluded.amount,
+                "operations_count": self.model.operations_count + 1,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def add_transaction(self, transaction: Transaction, trans_type: str) -> None:
+        """Учитывает транзакцию (доход/расход) в агрегатах."""
+        await self.add(
+            month=month_start(transaction.transaction_date),
+            envelope_id=transaction.envelope_id,
+            direction=trans_type,
+            amount=transaction.amount,
+            category_id=transaction.category_id,
+            user_id=transaction.user_id,
+        )
+
+    async def add_transfer(self, transfer: Transfer) -> None:
+        """Учитывает перевод в агрегатах обоих конвертов."""
+        month = month_start(transfer.transfer_date)
+        await self.add(month, transfer.from_envelope_id, TRANSFER_OUT, transfer.amount)
+        await self.add(month, transfer.to_envelope_id, TRANSFER_IN, transfer.amount)
+
+    async def get_totals_by_user_for_month(self, month: dt.date) -> list[Row]:
+        """Возвращает суммы доходов и расходов за месяц, сгруппированные по пользователю."""
+        total = func.sum(self.model.amount)
+        stmt = (
+            select(
+                self.model.user_id,
+                func.coalesce(total.filter(self.model.direction == "income"), 0).label("income"),
+                func.coalesce(total.filter(self.model.direction == "expense"), 0).label("expense"),
+            )
+            .where(self.model.month == month, self.model.direction.in_(("income", "expense")))
+            .group_by(self.model.user_id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def get_savings_total_for_month(self, month: dt.date) -> Decimal:
+        """Считает сумму переводов в накопительные конверты за месяц."""
+        stmt = (
+            select(func.sum(self.model.amount))
+            .join(Envelope, self.model.envelope_id == Envelope.id)
+            .where(
+                Envelope.is_savings.is_(True),
+                self.model.month == month,
+                self.model.direction == TRANSFER_IN,
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() or Decimal(0)
+
+    async def get_envelope_flows_for_month(self, envelope_id: int, month: dt.date) -> dict:
+        """Возвращает доходы, расходы и переводы В/ИЗ конверта за месяц."""
+        stmt = (
+            select(self.model.direction, func.sum(self.model.amount))
+            .where(self.model.envelope_id == envelope_id, self.model.month == month)
+            .group_by(self.model.direction)
+        )
+        result = await self.session.execute(stmt)
+        totals = dict(result.all())
+
+        return {
+            "income": totals.get("income", Decimal(0)),
+            "expense": totals.get("expense", Decimal(0)),
+            "transfers_in": totals.get(TRANSFER_IN, Decimal(0)),
+            "transfers_out": totals.get(TRANSFER_OUT, Decimal(0)),
+        }
+
+    async def get_envelope_net_after_month(self, envelope_id: int, month: dt.date) -> Decimal:
+        """Считает чистое движение по конверту (поступления минус списания) за все месяцы после указанного."""
+        signed_amount = case(
+            (self.model.direction.in_(("income", TRANSFER_IN)), self.model.amount),
+            else_=-self.model.amount,
+        )
+        stmt = select(func.sum(signed_amount)).where(self.model.envelope_id == envelope_id, self.model.month > month)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() or Decimal(0)
+
+    async def get_monthly_totals_for_year(self, year: int) -> list[Row]:
+        """Возвращает доходы, расходы и накопления по месяцам года одним запросом."""
+        total = func.sum(self.model.amount)
+        stmt = (
+            select(
+                self.model.month,
+                func.coalesce(total.filter(self.model.direction == "income"), 0).label("income"),
+                func.coalesce(total.filter(self.model.direction == "expense"), 0).label("expense"),
+                func.coalesce(
+                    total.filter(self.model.direction == TRANSFER_IN, Envelope.is_savings.is_(True)), 0
+                ).label("savings"),
+            )
+            .join(Envelope, self.model.envelope_id == Envelope.id)
+            .where(self.model.month >= dt.date(year, 1, 1), self.model.month < dt.date(year + 1, 1, 1))
+            .group_by(self.model.month)
+            .order_by(self.model.month)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def get_total_for_envelope(self, envelope_id: int, direction: str) -> Decimal:
+        """Считает сумму по конверту и направлению за все время."""
+        stmt = select(func.sum(self.model.amount)).where(
+            self.model.envelope_id == envelope_id,
+            self.model.direction == direction,
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() or Decimal(0)
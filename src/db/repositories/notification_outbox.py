@@ -0,0 +1,59 @@
+import datetime as dt
+
+from sqlalchemy import func, insert, select, update
+
+from src.db.models import NotificationOutbox
+from src.db.repositories.base import BaseRepository
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+
+class NotificationOutboxRepository(BaseRepository[NotificationOutbox]):
+    """Репозиторий исходящих уведомлений."""
+
+    def __init__(self, session):
+        super().__init__(NotificationOutbox, session)
+
+    async def enqueue(self, chat_ids: list[int], text: str, parse_mode: str | None = None) -> list[NotificationOutbox]:
+        """
+        Ставит уведомление в очередь для каждого чата одним INSERT. Не коммитит:
+        уведомление фиксируется вместе с операцией, о которой оно сообщает.
+        """
+        if not chat_ids:
+            return []
+
+        stmt = insert(self.model).returning(self.model)
+        rows = [{"chat_id": chat_id, "text": text, "parse_mode": parse_mode} for chat_id in chat_ids]
+        result = await self.session.scalars(stmt, rows)
+        return list(result.all())
+
+    async def get_pending(self, max_age: dt.timedelta) -> list[NotificationOutbox]:
+        """Возвращает неотправленные уведомления не старше max_age."""
+        stmt = (
+            select(self.model)
+            .where(self.model.status == STATUS_PENDING, self.model.created_at >= func.now() - max_age)
+            .order_by(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def expire_pending(self, max_age: dt.timedelta) -> int:
+        """Помечает неудачными неотправленные уведомления старше max_age."""
+        stmt = (
+            update(self.model)
+            .where(self.model.status == STATUS_PENDING, self.model.created_at < func.now() - max_age)
+            .values(status=STATUS_FAILED, last_error="expired")
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def set_status(self, notification_id: int, status: str, attempts: int, error: str | None = None) -> None:
+        """Фиксирует итог отправки и число сделанных попыток."""
+        values = {"status": status, "attempts": self.model.attempts + attempts, "last_error": error}
+
+        if status == STATUS_SENT:
+            values["sent_at"] = func.now()
+
+        await self.session.execute(update(self.model).where(self.model.id == notification_id).values(**values))
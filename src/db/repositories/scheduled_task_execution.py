@@ -0,0 +1,42 @@
+import datetime as dt
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.db.locks import TASK_RUN_LOCK_SPACE, try_advisory_xact_lock
+from src.db.models import ScheduledTaskExecution
+from src.db.repositories.base import BaseRepository
+
+
+class ScheduledTaskExecutionRepository(BaseRepository[ScheduledTaskExecution]):
+    """Репозиторий отметок о выполнении задач планировщика."""
+
+    def __init__(self, session):
+        super().__init__(ScheduledTaskExecution, session)
+
+    async def try_lock_run(self, task_id: int) -> bool:
+        """
+        Берет блокировку запуска задачи до конца текущей транзакции. Возвращает False,
+        если задачу прямо сейчас выполняет другой экземпляр бота.
+        """
+        return await try_advisory_xact_lock(self.session, (TASK_RUN_LOCK_SPACE, task_id))
+
+    async def claim(self, task_id: int, period: dt.date, chat_id: int = 0) -> bool:
+        """
+        Пытается занять ключ (задача, дата запуска, получатель). Возвращает False, если этот
+        запуск уже выполнялся. Не коммитит: вызывается в транзакции самой операции.
+        """
+        stmt = (
+            insert(self.model)
+            .values(task_id=task_id, period=period, chat_id=chat_id)
+            .on_conflict_do_nothing(constraint="uq_scheduled_task_executions_task_period_chat")
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def get_executed_since(self, since: dt.date) -> set[tuple[int, dt.date]]:
+        """Возвращает ключи (задача, дата запуска) выполненных общих запусков начиная с даты."""
+        stmt = select(self.model.task_id, self.model.period).where(self.model.period >= since, self.model.chat_id == 0)
+        result = await self.session.execute(stmt)
+        return {(task_id, period) for task_id, period in result.all()}
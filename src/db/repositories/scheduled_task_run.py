@@ -0,0 +1,33 @@
+from sqlalchemy import insert, select
+
+from src.db.models import ScheduledTaskRun
+from src.db.repositories.base import BaseRepository
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_INSUFFICIENT_FUNDS = "insufficient_funds"
+OUTCOME_SKIPPED = "skipped"
+OUTCOME_LOCKED = "locked"  # запуск в это же время выполнял другой экземпляр бота
+OUTCOME_ERROR = "error"
+
+
+class ScheduledTaskRunRepository(BaseRepository[ScheduledTaskRun]):
+    """Репозиторий журнала запусков задач планировщика."""
+
+    def __init__(self, session):
+        super().__init__(ScheduledTaskRun, session)
+
+    async def add_runs(self, rows: list[dict]) -> None:
+        """Записывает запуски одним INSERT без RETURNING и без загрузки объектов в сессию."""
+        await self.session.execute(insert(self.model.__table__), rows)
+        await self._save()
+
+    async def get_last_by_task(self, task_id: int, limit: int) -> list[ScheduledTaskRun]:
+        """Последние запуски задачи, новые первыми."""
+        stmt = (
+            select(self.model)
+            .where(self.model.task_id == task_id)
+            .order_by(self.model.started_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
@@ -7,11 +7,18 @@ from sqlalchemy.orm import joinedload
 from src.db.models import Transaction
 from src.db.models.category import Category
 from src.db.repositories.base import BaseRepository
+from src.db.repositories.monthly_rollup import MonthlyRollupRepository
 
 
 class TransactionRepository(BaseRepository[Transaction]):
     def __init__(self, session):
         super().__init__(Transaction, session)
+        self.rollup = MonthlyRollupRepository(session)
+
+    async def _on_create(self, instance: Transaction) -> None:
+        """Учитывает новую транзакцию в помесячных агрегатах."""
+        category = await self.session.get(Category, instance.category_id)
+        await self.rollup.add_transaction(instance, category.type)
 
     async def get_by_user_id(self, user_id: int) -> list[Transaction]:
         """Возвращает все транзакции конкретного пользователя."""
@@ -34,17 +41,6 @@ class TransactionRepository(BaseRepository[Transaction]):
 
         return list(result.scalars().all())
 
-    async def get_all_for_period(self, start_date: dt.date, end_date: dt.datetime) -> list[Transaction]:
-        """Возвращает все транзакции за указанный период, без фильтра по пользователю."""
-        stmt = select(self.model).where(
-            and_(
-                self.model.transaction_date >= start_date,
-                self.model.transaction_date < end_date,
-            )
-        ).options(joinedload(self.model.category))
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
-
     async def get_total_for_envelope_by_type(self, envelope_id: int, trans_type: str) -> Decimal:
         """Считает сумму транзакций для конверта по типу (доход/расход)."""
         stmt = (
@@ -56,42 +52,6 @@ class TransactionRepository(BaseRepository[Transaction]):
 
         return result.scalar_one_or_none() or Decimal(0)
 
-    async def get_income_for_envelope_and_period(
-        self,
-        envelope_id: int,
-        start_date: dt.date,
-        end_date: dt.datetime,
-    ) -> list[Transaction]:
-        """Возвращает доходы для конкретного конверта за период."""
-        stmt = select(self.model).join(Category).where(
-            and_(
-                self.model.envelope_id == envelope_id,
-                self.model.transaction_date >= start_date,
-                self.model.transaction_date < end_date,
-                Category.type == 'income',
-            )
-        )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
-
-    async def get_expense_for_envelope_and_period(
-        self,
-        envelope_id: int,
-        start_date: dt.date,
-        end_date: dt.datetime,
-    ) -> list[Transaction]:
-        """Возвращает расходы для конкретного конверта за период."""
-        stmt = select(self.model).join(Category).where(
-            and_(
-                self.model.envelope_id == envelope_id,
-                self.model.transaction_date >= start_date,
-                self.model.transaction_date < end_date,
-                Category.type == 'expense'
-            )
-        )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
-
     async def get_user_expenses_for_period_and_envelopes(
         self,
         user_id: int,
@@ -5,11 +5,21 @@ from sqlalchemy import and_, func, select
 
 from src.db.models import Envelope, Transfer
 from src.db.repositories.base import BaseRepository
+from src.db.repositories.monthly_rollup import MonthlyRollupRepository
 
 
 class TransferRepository(BaseRepository[Transfer]):
     def __init__(self, session):
         super().__init__(Transfer, session)
+        self.rollup = MonthlyRollupRepository(session)
+
+    async def _on_create(self, instance: Transfer) -> None:
+        """Учитывает новый перевод в помесячных агрегатах."""
+        if instance.transfer_date is None:
+            # Дату проставляет БД, она вернется после flush
+            await self.session.flush()
+
+        await self.rollup.add_transfer(instance)
 
     async def get_savings_for_period(self, start_date: dt.datetime, end_date: dt.datetime) -> list[Transfer]:
         """Возвращает переводы в накопительные конверты за период."""
@@ -47,56 +57,6 @@ class TransferRepository(BaseRepository[Transfer]):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none() or Decimal(0)
 
-    async def get_to_envelope_for_period(
-        self,
-        envelope_id: int,
-        start_date: dt.date,
-        end_date: dt.datetime,
-    ) -> list[Transfer]:
-        """Возвращает переводы В конверт за период."""
-        stmt = select(self.model).where(
-            and_(
-                self.model.to_envelope_id == envelope_id,
-                self.model.transfer_date >= start_date,
-                self.model.transfer_date < end_date,
-            )
-        )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
-
-    async def get_from_envelope_for_period(
-        self,
-        envelope_id: int,
-        start_date: dt.date,
-        end_date: dt.datetime,
-    ) -> list[Transfer]:
-        """Возвращает переводы ИЗ конверта за период."""
-        stmt = select(self.model).where(
-            and_(
-                self.model.from_envelope_id == envelope_id,
-                self.model.transfer_date >= start_date,
-                self.model.transfer_date < end_date,
-            )
-        )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
-
-    async def get_all_savings_for_period(self, start_date: dt.date, end_date: dt.datetime) -> list[Transfer]:
-        """Возвращает переводы в накопительные конверты за период."""
-        stmt = (
-            select(self.model)
-            .join(Envelope, self.model.to_envelope_id == Envelope.id)
-            .where(
-                and_(
-                    Envelope.is_savings == True,
-                    self.model.transfer_date >= start_date,
-                    self.model.transfer_date < end_date,
-                )
-            )
-        )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
-
     async def get_for_period(self, start_date: dt.date, end_date: dt.datetime) -> list[Transfer]:
         """Возвращает все переводы за период."""
         stmt = select(self.model).where(
@@ -24,3 +24,11 @@ class UserRepository(BaseRepository[User]):
         stmt = select(self.model).where(self.model.telegram_id == telegram_id)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def get_by_telegram_ids(self, telegram_ids: list[int]) -> list[User]:
+        """Возвращает пользователей по списку telegram_id одним запросом, в порядке списка."""
+        stmt = select(self.model).where(self.model.telegram_id.in_(telegram_ids))
+        result = await self.session.execute(stmt)
+        users_by_tg_id = {user.telegram_id: user for user in result.scalars().all()}
+
+        return [users_by_tg_id[tg_id] for tg_id in telegram_ids if tg_id in users_by_tg_id]
@@ -0,0 +1,63 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.report_cache import report_cache
+
+UNIT_OF_WORK_KEY = "unit_of_work"
+CHANGED_TABLES_KEY = "changed_tables"
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    """Открыта ли для сессии единица работы (запись только через flush, один коммит в конце)."""
+    return session.info.get(UNIT_OF_WORK_KEY, False)
+
+
+def mark_changed(session: AsyncSession, table_name: str) -> None:
+    """
+    Сообщает кэшу отчетов об изменении таблицы. Внутри единицы работы
+    изменение откладывается до коммита, чтобы кэш не увидел незакоммиченные данные.
+    """
+    if in_unit_of_work(session):
+        session.info.setdefault(CHANGED_TABLES_KEY, set()).add(table_name)
+    else:
+        report_cache.bump_version(table_name)
+
+
+def begin_unit_of_work(session: AsyncSession) -> None:
+    """Переводит сессию в режим единицы работы: дальше репозитории только делают flush."""
+    session.info[UNIT_OF_WORK_KEY] = True
+
+
+async def rollback(session: AsyncSession) -> None:
+    """Откатывает сессию вместе с отложенными инвалидациями кэша отчетов."""
+    await session.rollback()
+    session.info.pop(CHANGED_TABLES_KEY, None)
+
+
+async def commit(session: AsyncSession) -> None:
+    """Коммитит сессию и инвалидирует отчеты по измененным таблицам."""
+    await session.commit()
+
+    for table_name in session.info.pop(CHANGED_TABLES_KEY, set()):
+        report_cache.bump_version(table_name)
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Единица работы: репозитории внутри нее только делают flush, а коммит
+    выполняется один раз на выходе. При исключении все изменения откатываются.
+    """
+    begin_unit_of_work(session)
+
+    try:
+        yield session
+    except BaseException:
+        await rollback(session)
+        raise
+    else:
+        await commit(session)
+    finally:
+        session.info.pop(UNIT_OF_WORK_KEY, None)
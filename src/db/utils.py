@@ -1,9 +1,68 @@
-from sqlalchemy.ext.asyncio import AsyncEngine
+import logging
+from pathlib import Path
 
-from src.db.models.base import Base
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection, func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
+from alembic import command
+from src.core.settings import settings
+from src.db.locks import MIGRATIONS_LOCK
+
+ALEMBIC_INI_PATH = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Ревизия, описывающая схему, которую раньше создавал Base.metadata.create_all
+INITIAL_REVISION = "0001"
+
+
+def create_db_engine() -> AsyncEngine:
+    """Создает единственный на процесс движок БД с пулом соединений из настроек."""
+    return create_async_engine(
+        str(settings.database_url),
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+    )
+
+
+def _run_migrations(connection: Connection, config: Config, stamp_initial: bool) -> None:
+    config.attributes["connection"] = connection
+
+    if stamp_initial:
+        command.stamp(config, INITIAL_REVISION)
+
+    command.upgrade(config, "head")
+
+
+async def ensure_schema(engine: AsyncEngine) -> None:
+    """
+    Проверяет версию схемы одним запросом и запускает миграции Alembic,
+    только если база отстает от последней ревизии. Одновременно стартующие
+    экземпляры бота выполняют эту проверку по очереди.
+    """
+    config = Config(str(ALEMBIC_INI_PATH))
+    head_revision = ScriptDirectory.from_config(config).get_current_head()
 
-async def create_db_tables(engine: AsyncEngine):
-    """Создает таблицы в БД на основе моделей SQLAlchemy."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(select(func.pg_advisory_xact_lock(*MIGRATIONS_LOCK)))
+        result = await conn.execute(
+            text("SELECT to_regclass('alembic_version') IS NOT NULL, to_regclass('users') IS NOT NULL")
+        )
+        has_version_table, has_tables = result.one()
+        current_revision = None
+
+        if has_version_table:
+            current_revision = await conn.scalar(text("SELECT version_num FROM alembic_version"))
+
+        if current_revision == head_revision:
+            logging.info(f"Схема БД актуальна (ревизия {head_revision}).")
+            return
+
+        # База создана через create_all до появления миграций: исходную схему считаем примененной
+        stamp_initial = not has_version_table and has_tables
+        logging.info(f"Миграция схемы БД: {current_revision or 'нет версии'} -> {head_revision}")
+        await conn.run_sync(_run_migrations, config, stamp_initial)
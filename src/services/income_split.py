@@ -0,0 +1,59 @@
+import logging
+from collections import defaultdict
+from decimal import ROUND_DOWN, Decimal
+
+from src.db.models import Envelope
+from src.db.repo_holder import RepoHolder
+
+# Доли округляются вниз до копейки, чтобы сумма долей никогда не превысила доход
+KOPECK = Decimal("0.01")
+
+
+def calculate_income_shares(income: Decimal, percents: list[tuple[int, Decimal]]) -> list[tuple[int, Decimal]]:
+    """Доли дохода по правилам: [(id конверта-получателя, сумма)], нулевые доли отбрасываются."""
+    shares = []
+    remaining = income
+
+    for target_envelope_id, percent in percents:
+        share = min((income * percent / 100).quantize(KOPECK, rounding=ROUND_DOWN), remaining)
+
+        if share > 0:
+            shares.append((target_envelope_id, share))
+            remaining -= share
+
+    return shares
+
+
+async def apply_income_split_rules(
+    repo: RepoHolder, source_envelope_id: int, income: Decimal
+) -> list[tuple[Envelope, Decimal]]:
+    """
+    Распределяет только что зачисленный доход по правилам конверта. Вызывается в той же
+    транзакции, что и запись дохода, и переводит доли именно этого дохода, поэтому с конверта
+    не уходят деньги, которых на нем еще нет. Не коммитит. Возвращает выполненные переводы.
+    """
+    rules = await repo.income_split_rule.get_active_by_source(source_envelope_id)
+    shares = calculate_income_shares(income, [(rule.target_envelope_id, rule.percent) for rule in rules])
+
+    if not shares:
+        return []
+
+    deltas: dict[int, Decimal] = defaultdict(Decimal)
+    for target_envelope_id, share in shares:
+        deltas[source_envelope_id] -= share
+        deltas[target_envelope_id] += share
+
+    # Конверты блокируем в порядке id, как и при других переводах, а балансы меняем одним UPDATE
+    await repo.envelope.get_by_ids_for_update(sorted(deltas))
+    updated = await repo.envelope.adjust_balances(dict(deltas))
+
+    if updated is None:
+        logging.warning(f"Распределение дохода с конверта ID:{source_envelope_id} не выполнено: не хватает средств.")
+        return []
+
+    envelopes = {envelope.id: envelope for envelope in updated}
+
+    for target_envelope_id, share in shares:
+        await repo.transfer.create(from_envelope_id=source_envelope_id, to_envelope_id=target_envelope_id, amount=share)
+
+    return [(envelopes[target_envelope_id], share) for target_envelope_id, share in shares]
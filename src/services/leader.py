@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.db.locks import try_advisory_lock
+
+# Через сколько секунд простоя Postgres начинает проверять соединение ведущего и как быстро
+# признает его мертвым: без этого блокировка пропавшего по сети хоста держалась бы часами
+LEADER_TCP_KEEPALIVE = {"tcp_keepalives_idle": 5, "tcp_keepalives_interval": 2, "tcp_keepalives_count": 3}
+
+
+class LeaderElection:
+    """
+    Выбор ведущего экземпляра через сессионную advisory-блокировку Postgres.
+    Ведущий держит блокировку на отдельном соединении и периодически проверяет его;
+    если ведущий падает, Postgres снимает блокировку вместе с соединением, и резервный
+    экземпляр забирает ее при следующей попытке.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        lock: tuple[int, int],
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], None],
+        interval: float,
+    ) -> None:
+        self.engine = engine
+        self.lock = lock
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.interval = interval
+
+    async def run(self) -> None:
+        """Пытается стать ведущим, пока не будет отменен; после потери роли пробует снова."""
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    # Без открытой транзакции: соединение ведущего не висит в «idle in transaction»
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+                    if await try_advisory_lock(conn, self.lock):
+                        try:
+                            await self._lead(conn)
+                        finally:
+                            # Закрываем соединение, а не возвращаем в пул: вместе с ним снимается блокировка
+                            await conn.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Ошибка выбора ведущего экземпляра.")
+
+            await asyncio.sleep(self.interval)
+
+    async def _lead(self, conn: AsyncConnection) -> None:
+        for name, value in LEADER_TCP_KEEPALIVE.items():
+            await conn.execute(text(f"SET {name} = {value}"))
+
+        logging.info("Экземпляр стал ведущим.")
+
+        try:
+            await self.on_elected()
+
+            while True:
+                await asyncio.sleep(self.interval)
+                # Соединение живо — значит, блокировка все еще наша
+                await asyncio.wait_for(conn.execute(select(1)), timeout=self.interval)
+        finally:
+            self.on_demoted()
+            logging.warning("Экземпляр больше не ведущий.")
@@ -0,0 +1,164 @@
+import asyncio
+import datetime as dt
+import logging
+import time
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.core.settings import settings
+from src.db.models import NotificationOutbox
+from src.db.repo_holder import RepoHolder
+from src.db.repositories.notification_outbox import STATUS_FAILED, STATUS_SENT
+from src.db.unit_of_work import unit_of_work
+
+# Экспоненциальная пауза между повторами при сетевых ошибках
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+
+class TokenBucket:
+    """Ограничитель частоты: rate токенов в секунду, не больше capacity накоплено."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Ждет, пока появится токен, и забирает его. Ожидающие обслуживаются по очереди."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class NotificationDispatcher:
+    """
+    Рассылает уведомления из notification_outbox. Каждое сообщение отправляется
+    в своей задаче, поэтому медленный или недоступный чат не задерживает остальные.
+    Частота ограничена общим лимитом и лимитом на чат, как требует Telegram.
+    """
+
+    def __init__(self, global_rate: float, per_chat_rate: float, max_attempts: int) -> None:
+        self.per_chat_rate = per_chat_rate
+        self.max_attempts = max_attempts
+        self.session_pool: async_sessionmaker | None = None
+        self._global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        self._tasks: dict[int, asyncio.Task] = {}  # id уведомления -> задача, которая его отправляет
+
+    def setup(self, session_pool: async_sessionmaker) -> None:
+        self.session_pool = session_pool
+
+    def _get_chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.per_chat_rate, capacity=1)
+
+        return bucket
+
+    async def notify(self, bot: Bot, chat_ids: list[int], text: str, parse_mode: str | None = None) -> None:
+        """Ставит уведомление в очередь и запускает отправку, не дожидаясь ее."""
+        async with self.session_pool() as session, unit_of_work(session):
+            notifications = await RepoHolder(session).notification_outbox.enqueue(chat_ids, text, parse_mode)
+
+        self.dispatch(bot, notifications)
+
+    def dispatch(self, bot: Bot, notifications: list[NotificationOutbox]) -> None:
+        """
+        Запускает отправку уже закоммиченных уведомлений в фоне. Уведомления, которые
+        этот процесс уже отправляет (например, при повторном resume_pending после перевыборов), пропускаются.
+        """
+        for notification in notifications:
+            if notification.id in self._tasks:
+                continue
+
+            task = asyncio.create_task(self._deliver(bot, notification))
+            self._tasks[notification.id] = task
+            task.add_done_callback(lambda _, notification_id=notification.id: self._tasks.pop(notification_id, None))
+
+    async def resume_pending(self, bot: Bot) -> None:
+        """Досылает уведомления, не отправленные до перезапуска; слишком старые помечает неудачными."""
+        max_age = dt.timedelta(seconds=settings.notification_ttl)
+
+        async with self.session_pool() as session, unit_of_work(session):
+            repo = RepoHolder(session)
+            expired = await repo.notification_outbox.expire_pending(max_age)
+            notifications = await repo.notification_outbox.get_pending(max_age)
+
+        if expired:
+            logging.warning(f"Устаревших неотправленных уведомлений: {expired}, они не будут отправлены.")
+
+        if notifications:
+            logging.info(f"Досылаем {len(notifications)} уведомлений после перезапуска.")
+            self.dispatch(bot, notifications)
+
+    async def _deliver(self, bot: Bot, notification: NotificationOutbox) -> None:
+        send_kwargs = {"parse_mode": notification.parse_mode} if notification.parse_mode else {}
+        error = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            await self._get_chat_bucket(notification.chat_id).acquire()
+            await self._global_bucket.acquire()
+
+            try:
+                await bot.send_message(notification.chat_id, notification.text, **send_kwargs)
+            except TelegramRetryAfter as e:
+                error, delay = str(e), e.retry_after
+            except (TelegramNetworkError, TelegramServerError) as e:
+                error, delay = str(e), min(RETRY_BASE_DELAY * 2 ** (attempt - 1), RETRY_MAX_DELAY)
+            except TelegramAPIError as e:
+                # Бот заблокирован, чат не найден и т.п.: повтор не поможет
+                logging.error(
+                    f"Уведомление (ID:{notification.id}) пользователю {notification.chat_id} не доставлено: {e}"
+                )
+                await self._set_status(notification.id, STATUS_FAILED, attempt, str(e))
+                return
+            else:
+                await self._set_status(notification.id, STATUS_SENT, attempt)
+                return
+
+            logging.warning(
+                f"Уведомление (ID:{notification.id}) пользователю {notification.chat_id}: попытка {attempt} "
+                f"не удалась ({error}), повтор через {delay} с."
+            )
+            await asyncio.sleep(delay)
+
+        logging.error(f"Уведомление (ID:{notification.id}) пользователю {notification.chat_id} не доставлено: {error}")
+        await self._set_status(notification.id, STATUS_FAILED, self.max_attempts, error)
+
+    async def _set_status(self, notification_id: int, status: str, attempts: int, error: str | None = None) -> None:
+        try:
+            async with self.session_pool() as session, unit_of_work(session):
+                await RepoHolder(session).notification_outbox.set_status(notification_id, status, attempts, error)
+        except Exception:
+            # Уведомление останется в очереди и будет отправлено повторно при следующем resume_pending
+            logging.exception(f"Не удалось сохранить статус уведомления (ID:{notification_id}): {status}")
+
+    async def shutdown(self) -> None:
+        """Прерывает отправку: незавершенные уведомления остаются в очереди до следующего старта."""
+        tasks = list(self._tasks.values())
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+notification_dispatcher = NotificationDispatcher(
+    global_rate=settings.notification_global_rate,
+    per_chat_rate=settings.notification_per_chat_rate,
+    max_attempts=settings.notification_max_attempts,
+)
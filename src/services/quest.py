@@ -1,10 +1,18 @@
 from decimal import Decimal
 
+from src.core.report_cache import report_cache
 from src.db.repo_holder import RepoHolder
+from src.db.repositories.monthly_rollup import TRANSFER_IN
 
 
 async def get_quest_report(user_id: int, repo: RepoHolder) -> str:
-    """Готовит отчет о прогрессе по текущей главной цели."""
+    """Готовит отчет о прогрессе по текущей главной цели (с кэшированием)."""
+    # Квест не зависит от месяца, поэтому месяц в ключе кэша не указываем
+    return await report_cache.get_or_build("quest", user_id, None, lambda: _build_quest_report(repo))
+
+
+async def _build_quest_report(repo: RepoHolder) -> str:
+    """Собирает текст отчета о прогрессе по текущей главной цели."""
     system_state = await repo.state.get_by_id(1)
 
     if not system_state or not system_state.current_phase_id:
@@ -15,7 +23,7 @@ async def get_quest_report(user_id: int, repo: RepoHolder) -> str:
     if not goal:
         return "Для текущей фазы не найдена главная цель. Проверьте настройки."
 
-    current_amount = await repo.transfer.get_total_for_envelope(goal.linked_envelope_id)
+    current_amount = await repo.monthly_rollup.get_total_for_envelope(goal.linked_envelope_id, TRANSFER_IN)
     target_amount = goal.target_amount
     progress_percent = (Decimal(current_amount) / target_amount * 100) if target_amount > 0 else Decimal(0)
 
@@ -1,103 +1,184 @@
-import calendar
+import asyncio
 import datetime as dt
 import logging
+import time
+from contextlib import asynccontextmanager
 from decimal import Decimal
+from typing import AsyncIterator, NamedTuple
 
 import pytz
 from aiogram import Bot
+from apscheduler.events import EVENT_JOB_SUBMITTED, JobSubmissionEvent
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from workalendar.europe import Russia
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.core.settings import settings
+from src.core.timezones import resolve_timezone
 from src.db.models.envelope import Envelope
 from src.db.models.scheduled_task import ScheduledTask
 from src.db.repo_holder import RepoHolder
+from src.db.repositories.scheduled_task_run import (
+    OUTCOME_ERROR,
+    OUTCOME_INSUFFICIENT_FUNDS,
+    OUTCOME_LOCKED,
+    OUTCOME_SKIPPED,
+    OUTCOME_SUCCESS,
+)
+from src.db.unit_of_work import unit_of_work
+from src.services.notifications import notification_dispatcher
+from src.services.triggers import BusinessDayTrigger
 
 # Глобальная переменная для хранения планировщика
-scheduler = AsyncIOScheduler()
+scheduler = AsyncIOScheduler(
+    job_defaults={
+        "misfire_grace_time": settings.scheduler_misfire_grace_time,
+        "coalesce": settings.scheduler_coalesce,
+    }
+)
 
-national_calendar = Russia()
-# Дни, которые переносятся НАЗАД на последний рабочий день
-DAYS_TO_MOVE_BACK = {5, 20}
-# Дни, которые переносятся ВПЕРЁД на первый рабочий день
-DAYS_TO_MOVE_FORWARD = {10, 25}
+# Префикс ID джобов, созданных по scheduled_tasks
+TASK_JOB_PREFIX = "task_"
+# ID джоба периодической сверки расписания с БД
+RESYNC_JOB_ID = "resync_tasks"
+# Параметры, с которыми создан каждый джоб задачи: по ним синхронизация понимает, что изменилось
+_job_signatures: dict[str, tuple] = {}
 
+# Отложенная синхронизация: срок запуска и фоновая задача, которая его ждет
+_sync_deadline = 0.0
+_sync_task: asyncio.Task | None = None
 
-def is_weekend(date_obj: dt.date) -> bool:
-    """Проверяет, является ли дата выходным (суббота или воскресенье)."""
-    return date_obj.weekday() >= calendar.SATURDAY
+# Плановое время запуска, с которым планировщик отдал джоб на выполнение, по ID джоба
+_planned_run_times: dict[str, dt.datetime] = {}
 
 
-def is_holiday(date_obj: dt.date) -> bool:
-    """Проверяет, является ли дата официальным праздником."""
-    return national_calendar.is_holiday(date_obj)
+def _remember_planned_run_time(event: JobSubmissionEvent) -> None:
+    """
+    Запоминает плановое время запуска джоба задачи. Событие приходит до того, как
+    корутина джоба начнет выполняться; при coalesce берется последний из пропущенных запусков.
+    """
+    if event.job_id.startswith(TASK_JOB_PREFIX) and event.scheduled_run_times:
+        _planned_run_times[event.job_id] = event.scheduled_run_times[-1]
 
 
-def find_nearest_workday(original_date: dt.date, move_forward: bool) -> dt.date:
-    """Находит ближайший рабочий день, двигаясь вперед или назад."""
-    current_date = original_date
+scheduler.add_listener(_remember_planned_run_time, EVENT_JOB_SUBMITTED)
 
-    while is_weekend(current_date) or is_holiday(current_date):
-        if move_forward:
-            current_date += dt.timedelta(days=1)
-        else:
-            current_date -= dt.timedelta(days=1)
 
-    return current_date
+def get_task_job_id(task_id: int, chat_id: int) -> str:
+    """ID джоба напоминания: у каждого получателя свой джоб."""
+    return f"{TASK_JOB_PREFIX}{task_id}_{chat_id}"
 
 
-def get_corrected_day(original_day_of_month: int, task: ScheduledTask, tz: pytz.BaseTzInfo) -> int:
-    """Получаем корректный день для уведомленя"""
-    now = dt.datetime.now(tz=tz) # Используем таймзону планировщика
-    corrected_day = original_day_of_month
+def get_transfer_group_job_id(day: int, hour: int) -> str:
+    """ID общего джоба авто-переводов, запланированных на один день и час."""
+    return f"{TASK_JOB_PREFIX}transfers_{day}_{hour}"
 
-    try:
-        target_date_this_month = dt.date(now.year, now.month, original_day_of_month)
-    except ValueError:
-        last_day_of_month = calendar.monthrange(now.year, now.month)[1]
-        target_date_this_month = dt.date(now.year, now.month, last_day_of_month)
-        logging.warning(f"Задача на {original_day_of_month} день, но в текущем месяце нет такого дня. Используем {last_day_of_month}.")
-
-    if original_day_of_month in DAYS_TO_MOVE_BACK:
-        # Если день выпадает на выходной, переносим НАЗАД
-        if is_weekend(target_date_this_month):
-            corrected_date = find_nearest_workday(target_date_this_month, move_forward=False)
-            corrected_day = corrected_date.day
-            logging.info(
-                f"Задача (ID:{task.id}) на {original_day_of_month} перенесена НАЗАД на {corrected_day} из-за выходного."
-            )
-    elif original_day_of_month in DAYS_TO_MOVE_FORWARD:
-        # Если день выпадает на выходной, переносим ВПЕРЁД
-        if is_weekend(target_date_this_month):
-            corrected_date = find_nearest_workday(target_date_this_month, move_forward=True)
-            corrected_day = corrected_date.day
-            logging.info(
-                f"Задача (ID:{task.id}) на {original_day_of_month} перенесена ВПЕРЁД на {corrected_day} из-за выходного." # noqa: E501
-            )
 
-    return corrected_day
+class AutoTransfer(NamedTuple):
+    """Параметры авто-перевода одной задачи, передаваемые в джоб группы."""
 
+    task_id: int
+    amount: Decimal
+    from_envelope_id: int
+    to_envelope_id: int
 
-async def get_scheduler_timezone_and_user(session: async_sessionmaker) -> pytz.BaseTzInfo:
-    """Извлекает таймзону пользователя и возвращает её."""
-    repo = RepoHolder(session)
-    user_timezone = "UTC"
+    @classmethod
+    def from_task(cls, task: ScheduledTask) -> "AutoTransfer":
+        return cls(task.id, task.amount, task.from_envelope_id, task.to_envelope_id)
 
-    for user_id in settings.allowed_telegram_ids:
-        user = await repo.user.get_by_telegram_id(user_id)
 
-        if user and user.timezone:
-            user_timezone = user.timezone
-            break
+def pop_planned_run_time(job_id: str) -> dt.datetime | None:
+    """
+    Плановое время текущего запуска джоба в таймзоне его триггера
+    (None, если джоб вызван не планировщиком).
+    """
+    return _planned_run_times.pop(job_id, None)
+
+
+class TaskRunResult:
+    """Итог запуска задачи, который заполняет сама джоба."""
+
+    __slots__ = "outcome", "amount", "error"
+
+    def __init__(self) -> None:
+        self.outcome = OUTCOME_SUCCESS
+        self.amount: Decimal | None = None
+        self.error: str | None = None
+
+
+@asynccontextmanager
+async def track_task_runs(
+    session_pool: async_sessionmaker,
+    task_ids: list[int],
+    planned_at: dt.datetime | None,
+    chat_id: int | None = None,
+) -> AsyncIterator[dict[int, TaskRunResult]]:
+    """
+    Замеряет запуск одной или нескольких задач и пишет их в журнал одним INSERT в отдельной
+    короткой транзакции, так что запись сохраняется и тогда, когда транзакция самой джобы откатилась.
+    chat_id — получатель, если задача запускается отдельно для каждого пользователя (напоминания).
+    """
+    runs = {task_id: TaskRunResult() for task_id in task_ids}
+    started_at = dt.datetime.now(dt.timezone.utc)
+    started = time.perf_counter()
 
     try:
-        tz = pytz.timezone(user_timezone)
-        logging.info(f"Установлена таймзона: {tz}")
-        return tz
-    except pytz.UnknownTimeZoneError:
-        logging.warning(f"Неизвестная таймзона '{user_timezone}', используем UTC.")
-        return pytz.utc
+        yield runs
+    except Exception as e:
+        for run in runs.values():
+            run.outcome, run.error = OUTCOME_ERROR, f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration_ms = round((time.perf_counter() - started) * 1000)
+        rows = [
+            {
+                "task_id": task_id,
+                "planned_at": planned_at,
+                "started_at": started_at,
+                "duration_ms": duration_ms,
+                "outcome": run.outcome,
+                "amount": run.amount,
+                "error": run.error,
+                "chat_id": chat_id,
+            }
+            for task_id, run in runs.items()
+        ]
+
+        try:
+            async with session_pool() as session:
+                await RepoHolder(session).task_run.add_runs(rows)
+        except Exception:
+            logging.exception(f"Не удалось записать запуски задач {task_ids} в журнал.")
+
+
+@asynccontextmanager
+async def track_task_run(
+    session_pool: async_sessionmaker, task_id: int, planned_at: dt.datetime | None, chat_id: int | None = None
+) -> AsyncIterator[TaskRunResult]:
+    """Замеряет запуск одной задачи (см. track_task_runs)."""
+    async with track_task_runs(session_pool, [task_id], planned_at, chat_id) as runs:
+        yield runs[task_id]
+
+
+async def get_user_timezones(session: async_sessionmaker) -> tuple[pytz.BaseTzInfo, dict[int, pytz.BaseTzInfo]]:
+    """
+    Загружает пользователей одним запросом и возвращает таймзону планировщика (первого
+    пользователя из allowed_telegram_ids, у которого она задана) и таймзоны получателей
+    напоминаний по telegram_id. По таймзоне планировщика выполняются общие авто-переводы.
+    """
+    users = await RepoHolder(session).user.get_by_telegram_ids(settings.allowed_telegram_ids)
+    timezone_names = {user.telegram_id: user.timezone for user in users}
+
+    scheduler_timezone = pytz.utc
+    for telegram_id in settings.allowed_telegram_ids:
+        if timezone_names.get(telegram_id):
+            scheduler_timezone = resolve_timezone(timezone_names[telegram_id], pytz.utc)
+            break
+
+    user_timezones = {
+        telegram_id: resolve_timezone(timezone_names.get(telegram_id), scheduler_timezone)
+        for telegram_id in settings.allowed_telegram_ids
+    }
+    return scheduler_timezone, user_timezones
 
 
 async def get_active_scheduled_tasks(session: async_sessionmaker) -> list[ScheduledTask]:
@@ -114,146 +195,329 @@ async def get_active_scheduled_tasks(session: async_sessionmaker) -> list[Schedu
     return [task for task in tasks if task.is_active]
 
 
-def create_job_details(task: ScheduledTask, bot: Bot) -> tuple | None:
-    """Определяет job_func и job_kwargs для конкретной задачи."""
-    job_func, job_kwargs = None, {"bot": bot}
+def create_task_jobs(
+    tasks: list[ScheduledTask], bot: Bot, session_pool: async_sessionmaker, user_timezones: dict[int, pytz.BaseTzInfo]
+) -> list[tuple[str, object, dict, BusinessDayTrigger]]:
+    """
+    Описывает джобы задач: (job_id, job_func, job_kwargs, trigger). Напоминание получает
+    отдельный джоб на каждого пользователя в его таймзоне. Авто-переводы с одинаковыми днем
+    и часом объединяются в один джоб в таймзоне планировщика и выполняются одной транзакцией.
+    """
+    jobs = []
+    transfer_groups: dict[tuple[int, int], list[ScheduledTask]] = {}
+
+    for task in tasks:
+        if task.task_type == "reminder":
+            jobs.extend(
+                (
+                    get_task_job_id(task.id, chat_id),
+                    send_reminder,
+                    {
+                        "bot": bot,
+                        "session_pool": session_pool,
+                        "task_id": task.id,
+                        "reminder_text": task.reminder_text,
+                        "chat_id": chat_id,
+                    },
+                    get_task_trigger(task, timezone),
+                )
+                for chat_id, timezone in user_timezones.items()
+            )
+        elif task.task_type == "auto_transfer":
+            transfer_groups.setdefault((int(task.cron_day), int(task.cron_hour)), []).append(task)
+
+    for (day, hour), group in transfer_groups.items():
+        job_id = get_transfer_group_job_id(day, hour)
+        transfers = tuple(sorted(AutoTransfer.from_task(task) for task in group))
+        job_kwargs = {"bot": bot, "session_pool": session_pool, "transfers": transfers, "job_id": job_id}
+        jobs.append((job_id, perform_auto_transfers, job_kwargs, get_task_trigger(group[0])))
+
+    return jobs
 
-    if task.task_type == "reminder":
-        job_func = send_reminder
-        job_kwargs["reminder_text"] = task.reminder_text
-        job_kwargs["task_id"] = task.id
-    elif task.task_type == "auto_transfer":
-        job_func = perform_auto_transfer
-        job_kwargs.update({
-            "amount": task.amount,
-            "from_envelope_id": task.from_envelope_id,
-            "to_envelope_id": task.to_envelope_id,
-        })
 
-    return (job_func, job_kwargs) if job_func else None
+def get_task_trigger(task: ScheduledTask, timezone: pytz.BaseTzInfo | None = None) -> BusinessDayTrigger:
+    """Триггер задачи в указанной таймзоне (по умолчанию — в таймзоне планировщика)."""
+    return BusinessDayTrigger(day=int(task.cron_day), hour=int(task.cron_hour), timezone=timezone or scheduler.timezone)
 
 
-def add_job_to_scheduler(
-    job_func, job_kwargs, task_id: int, corrected_day: int, cron_hour: int
-):
+def add_job_to_scheduler(job_func, job_kwargs, job_id: str, trigger: BusinessDayTrigger):
     """Добавляет задачу в планировщик."""
     scheduler.add_job(
         job_func,
-        trigger="cron",
-        day=corrected_day,
-        hour=cron_hour,
+        trigger=trigger,
         kwargs=job_kwargs,
-        id=f"task_{task_id}",
+        id=job_id,
+        replace_existing=True,
     )
 
 
-async def get_envelopes_for_transfer(
-    repo: RepoHolder, from_id: int, to_id: int
-) -> tuple[Envelope | None, Envelope | None]:
-    """Извлекает конверты по ID."""
-    env_from = await repo.envelope.get_by_id(from_id)
-    env_to = await repo.envelope.get_by_id(to_id)
+async def execute_transfer_and_update_balances(
+    repo: RepoHolder, amount: Decimal, env_from: Envelope, env_to: Envelope
+) -> bool:
+    """Выполняет перевод и обновляет балансы. Возвращает False, если на конверте не хватает средств."""
+    if await repo.envelope.move_balance(env_from.id, env_to.id, amount) is None:
+        return False
 
-    if not env_from or not env_to:
-        logging.error(f"Не найден один из конвертов: from_id={from_id} или to_id={to_id}")
-        return None, None
+    await repo.transfer.create(from_envelope_id=env_from.id, to_envelope_id=env_to.id, amount=amount)
+    return True
 
-    return env_from, env_to
 
+def get_fire_date(planned_at: dt.datetime | None) -> dt.date:
+    """
+    Дата запуска по расписанию (ключ идемпотентности). Берется из планового времени
+    в таймзоне триггера, а не из часов, поэтому опоздавший после полуночи запуск не сдвигает ключ.
+    """
+    return planned_at.date() if planned_at else dt.datetime.now(tz=scheduler.timezone).date()
 
-async def execute_transfer_and_update_balances(
-    repo: RepoHolder, amount: Decimal, env_from: Envelope, env_to: Envelope
-) -> tuple[bool, str]:
-    """Выполняет перевод и обновляет балансы, возвращая статус и сообщение."""
-    if env_from.balance < amount:
-        msg = f"⚠️ **Авто-перевод не выполнен!**\nНедостаточно средств на «{env_from.name}» для перевода {amount:.2f} ₽."
-        return False, msg
 
-    await repo.transfer.create(from_envelope_id=env_from.id, to_envelope_id=env_to.id, amount=amount)
-    await repo.envelope.update(env_from, balance=env_from.balance - amount)
-    await repo.envelope.update(env_to, balance=env_to.balance + amount)
-    msg = f"🤖 **Авто-перевод выполнен!**\n✅ {amount:.2f} ₽ переведено с «{env_from.name}» на «{env_to.name}»."
+async def send_reminder(bot: Bot, session_pool: async_sessionmaker, reminder_text: str, task_id: int, chat_id: int):
+    """Отправляет текстовое напоминание пользователю в его местное время."""
+    planned_at = pop_planned_run_time(get_task_job_id(task_id, chat_id))
 
-    return True, msg
+    async with track_task_run(session_pool, task_id, planned_at, chat_id) as run:
+        if not reminder_text:
+            run.outcome = OUTCOME_SKIPPED
+            return
 
+        async with session_pool() as session, unit_of_work(session):
+            repo = RepoHolder(session)
+
+            # Напоминания пользователей срабатывают одновременно, поэтому вместо общей блокировки задачи
+            # повтор отсекает ключ с получателем: конкурирующий INSERT ждет коммита первого
+            if not await repo.task_execution.claim(task_id, get_fire_date(planned_at), chat_id):
+                logging.info(f"Напоминание (ID:{task_id}) пользователю {chat_id} уже отправлено, пропускаем.")
+                run.outcome = OUTCOME_SKIPPED
+                return
+
+            logging.info(f"Отправка напоминания (ID:{task_id}) пользователю {chat_id}: '{reminder_text}'")
+            notifications = await repo.notification_outbox.enqueue([chat_id], reminder_text)
+
+        notification_dispatcher.dispatch(bot, notifications)
+
+
+async def perform_auto_transfers(
+    bot: Bot,
+    session_pool: async_sessionmaker,
+    transfers: tuple[AutoTransfer, ...],
+    job_id: str | None = None,
+    planned_at: dt.datetime | None = None,
+) -> None:
+    """
+    Выполняет авто-переводы, запланированные на одно время, одной транзакцией и отправляет
+    одно общее уведомление. Задачи обрабатываются в порядке id, конверты блокируются в порядке id.
+    За одну дату запуска по расписанию каждая задача выполняется не больше одного раза.
+    """
+    if planned_at is None and job_id is not None:
+        planned_at = pop_planned_run_time(job_id)
+
+    fire_date = get_fire_date(planned_at)
+    transfers = sorted(transfers)
+
+    async with track_task_runs(session_pool, [transfer.task_id for transfer in transfers], planned_at) as runs:
+        # Ключи идемпотентности, переводы, их записи, агрегаты и уведомление коммитятся одной транзакцией
+        async with session_pool() as session, unit_of_work(session):
+            repo = RepoHolder(session)
+            pending = []
+
+            for transfer in transfers:
+                # Вторая защита после выбора ведущего: один и тот же запуск не выполняется параллельно
+                if not await repo.task_execution.try_lock_run(transfer.task_id):
+                    logging.info(f"Авто-перевод (ID:{transfer.task_id}) выполняет другой экземпляр бота, пропускаем.")
+                    runs[transfer.task_id].outcome = OUTCOME_LOCKED
+                elif not await repo.task_execution.claim(transfer.task_id, fire_date):
+                    logging.info(f"Авто-перевод (ID:{transfer.task_id}) на {fire_date} уже выполнен, пропускаем.")
+                    runs[transfer.task_id].outcome = OUTCOME_SKIPPED
+                else:
+                    pending.append(transfer)
+
+            if not pending:
+                return
+
+            envelope_ids = {transfer.from_envelope_id for transfer in pending} | {
+                transfer.to_envelope_id for transfer in pending
+            }
+            envelopes = {env.id: env for env in await repo.envelope.get_by_ids_for_update(sorted(envelope_ids))}
+            lines = []
+
+            for transfer in pending:
+                run = runs[transfer.task_id]
+                env_from = envelopes.get(transfer.from_envelope_id)
+                env_to = envelopes.get(transfer.to_envelope_id)
+
+                if env_from is None or env_to is None:
+                    logging.error(
+                        f"Авто-перевод (ID:{transfer.task_id}): не найден один из конвертов "
+                        f"from_id={transfer.from_envelope_id} или to_id={transfer.to_envelope_id}"
+                    )
+                    run.outcome, run.error = OUTCOME_ERROR, "Не найден один из конвертов"
+                    continue
+
+                if env_from.id == env_to.id:
+                    logging.error(f"Авто-перевод (ID:{transfer.task_id}): конверты списания и зачисления совпадают")
+                    run.outcome, run.error = OUTCOME_ERROR, "Перевод конверта на самого себя"
+                    continue
+
+                logging.info(f"Извлечение auto_transfer: {transfer.amount} из '{env_from.name}' в '{env_to.name}'")
+
+                if await execute_transfer_and_update_balances(repo, transfer.amount, env_from, env_to):
+                    run.amount = transfer.amount
+                    lines.append(f"✅ {transfer.amount:.2f} ₽ с «{env_from.name}» на «{env_to.name}»")
+                else:
+                    run.outcome = OUTCOME_INSUFFICIENT_FUNDS
+                    lines.append(
+                        f"⚠️ {transfer.amount:.2f} ₽ с «{env_from.name}» на «{env_to.name}» — "
+                        f"недостаточно средств, перевод не выполнен"
+                    )
+
+            if not lines:
+                return
+
+            # О неудаче из-за нехватки средств тоже сообщаем: иначе пропуск перевода никто не заметит
+            msg = "🤖 **Авто-переводы:**\n" + "\n".join(lines)
+            notifications = await repo.notification_outbox.enqueue(settings.allowed_telegram_ids, msg, "Markdown")
+
+        notification_dispatcher.dispatch(bot, notifications)
+
+
+async def catch_up_missed_auto_transfers(bot: Bot, session_pool: async_sessionmaker) -> None:
+    """
+    Выполняет авто-переводы, время которых прошло, пока бот был остановлен.
+    Учитываются только запуски не старше misfire grace; повтор отсекает ключ идемпотентности.
+    """
+    now = dt.datetime.now(tz=scheduler.timezone)
+    grace = dt.timedelta(seconds=settings.scheduler_misfire_grace_time)
 
-async def send_transfer_notification(bot: Bot, message: str):
-    """Отправляет уведомление о переводе всем пользователям."""
-    for user_id in settings.allowed_telegram_ids:
-        try:
-            await bot.send_message(user_id, message, parse_mode="Markdown")
-        except Exception as e:
-            logging.error(f"Ошибка отправки уведомления авто-перевода пользователю {user_id}: {e}")
+    async with session_pool() as session:
+        tasks = [task for task in await get_active_scheduled_tasks(session) if task.task_type == "auto_transfer"]
+        executed = await RepoHolder(session).task_execution.get_executed_since((now - grace).date())
 
+    missed: dict[dt.datetime, list[AutoTransfer]] = {}
 
-async def send_reminder(bot: Bot, reminder_text: str, task_id: int | None = None):
-    """Отправляет текстовое напоминание обоим пользователям."""
-    if not reminder_text:
-        return
+    for task in tasks:
+        fire_time = get_task_trigger(task).get_previous_fire_time(now)
 
-    logging.info(f"Отправка напоминания (ID:{task_id}): '{reminder_text}'")
+        if fire_time is None or now - fire_time > grace or (task.id, fire_time.date()) in executed:
+            continue
 
-    for user_id in settings.allowed_telegram_ids:
-        try:
-            await bot.send_message(user_id, reminder_text)
-        except Exception as e:
-            logging.error(f"Ошибка отправки напоминаня пользователю {user_id}: {e}")
+        missed.setdefault(fire_time, []).append(AutoTransfer.from_task(task))
 
+    # Как и по расписанию, переводы с одним временем запуска выполняются одной транзакцией
+    for fire_time, transfers in sorted(missed.items()):
+        logging.info(f"Догоняем пропущенные авто-переводы {[t.task_id for t in transfers]}, время запуска {fire_time}.")
+        await perform_auto_transfers(bot, session_pool, tuple(transfers), planned_at=fire_time)
 
-async def perform_auto_transfer(bot: Bot, amount: Decimal, from_envelope_id: int, to_envelope_id: int) -> None:
-    """Выполняет автоматический перевод и уведомляет пользователей."""
-    engine = create_async_engine(str(settings.database_url))
-    session_pool = async_sessionmaker(engine, expire_on_commit=False)
 
+def _get_job_signature(job_func, job_kwargs: dict, trigger: BusinessDayTrigger) -> tuple:
+    """Описывает джоб значениями, от которых зависит его расписание и поведение."""
+    task_params = tuple(sorted((k, v) for k, v in job_kwargs.items() if k not in ("bot", "session_pool")))
+    return job_func.__name__, task_params, trigger.day, trigger.hour, str(trigger.timezone)
+
+
+async def sync_scheduler_jobs(bot: Bot, session_pool: async_sessionmaker):
+    """
+    Приводит джобы планировщика к активным задачам текущей фазы: добавляет новые,
+    пересоздает изменившиеся и удаляет лишние, не трогая остальные.
+    """
     async with session_pool() as session:
-        repo = RepoHolder(session)
-        env_from, env_to = await get_envelopes_for_transfer(repo, from_envelope_id, to_envelope_id)
+        scheduler.timezone, user_timezones = await get_user_timezones(session)
+        active_tasks = await get_active_scheduled_tasks(session)
 
-        if env_from is None or env_to is None:
-            return
+    desired_job_ids = set()
+    added, updated = 0, 0
 
-        logging.info(f"Извлечение auto_transfer: {amount} из '{env_from.name}' в '{env_to.name}'")
+    for job_id, job_func, job_kwargs, trigger in create_task_jobs(active_tasks, bot, session_pool, user_timezones):
+        desired_job_ids.add(job_id)
 
-        transfer_successful, msg = await execute_transfer_and_update_balances(repo, amount, env_from, env_to)
+        signature = _get_job_signature(job_func, job_kwargs, trigger)
+        job_exists = scheduler.get_job(job_id) is not None
 
-        if transfer_successful:
-            await send_transfer_notification(bot, msg)
+        if job_exists and _job_signatures.get(job_id) == signature:
+            continue
 
+        add_job_to_scheduler(job_func, job_kwargs, job_id, trigger)
+        _job_signatures[job_id] = signature
 
-async def reload_scheduler_jobs(bot: Bot, session_pool: async_sessionmaker):
-    global scheduler
-    scheduler.remove_all_jobs()
+        if job_exists:
+            updated += 1
+        else:
+            added += 1
 
-    async with session_pool() as session:
-        scheduler_timezone = await get_scheduler_timezone_and_user(session)
-        scheduler.timezone = scheduler_timezone
-        active_tasks = await get_active_scheduled_tasks(session)
+    removed = 0
+
+    for job in scheduler.get_jobs():
+        if job.id.startswith(TASK_JOB_PREFIX) and job.id not in desired_job_ids:
+            job.remove()
+            _job_signatures.pop(job.id, None)
+            removed += 1
 
-        for task in active_tasks:
-            job_details = create_job_details(task, bot)
+    logging.info(
+        f"Планировщик синхронизирован: добавлено {added}, обновлено {updated}, удалено {removed}, "
+        f"всего джобов задач {len(desired_job_ids)}."
+    )
 
-            if job_details:
-                job_func, job_kwargs = job_details
 
-                corrected_day = get_corrected_day(int(task.cron_day), task, scheduler_timezone)
+async def _run_debounced_sync(bot: Bot, session_pool: async_sessionmaker):
+    """Ждет, пока запросы синхронизации перестанут поступать, и выполняет одну синхронизацию."""
+    loop = asyncio.get_running_loop()
 
-                add_job_to_scheduler(
-                    job_func, job_kwargs, task.id, corrected_day, int(task.cron_hour)
-                )
+    while True:
+        while (delay := _sync_deadline - loop.time()) > 0:
+            await asyncio.sleep(delay)
 
+        requested_deadline = _sync_deadline
+
+        try:
+            await sync_scheduler_jobs(bot, session_pool)
+        except Exception:
+            logging.exception("Ошибка синхронизации планировщика.")
+
+        # Запрос, пришедший во время синхронизации, требует еще одного прохода
+        if _sync_deadline == requested_deadline:
+            return
+
+
+def request_scheduler_sync(bot: Bot, session_pool: async_sessionmaker):
+    """
+    Запрашивает синхронизацию планировщика в фоне. Несколько запросов подряд
+    (например, быстрые переключения задач) сливаются в одну синхронизацию.
+    Изменения задач должны быть закоммичены до вызова.
+    """
+    global _sync_deadline, _sync_task
+
+    # На резервном экземпляре планировщик не запущен: изменение подхватит периодическая синхронизация ведущего
+    if not scheduler.running:
+        return
+
+    _sync_deadline = asyncio.get_running_loop().time() + settings.scheduler_sync_debounce
+
+    if _sync_task is None or _sync_task.done():
+        _sync_task = asyncio.create_task(_run_debounced_sync(bot, session_pool))
+
+
+async def start_scheduler_on_leader(bot: Bot, session_pool: async_sessionmaker):
+    """
+    Запускает планировщик на ведущем экземпляре: джобы задач, их периодическая сверка с БД
+    (задачи могли измениться через другой экземпляр), досылка уведомлений и пропущенные переводы.
+    """
+    start_scheduler()
     scheduler.add_job(
-        reload_scheduler_jobs,
-        trigger="cron",
-        day=1,
-        hour=0,
-        minute=1,
+        sync_scheduler_jobs,
+        trigger="interval",
+        seconds=settings.scheduler_resync_interval,
         kwargs={"bot": bot, "session_pool": session_pool},
-        id="monthly_scheduler_reloader",
+        id=RESYNC_JOB_ID,
         replace_existing=True,
     )
+    await sync_scheduler_jobs(bot, session_pool)
+    await notification_dispatcher.resume_pending(bot)
+    await catch_up_missed_auto_transfers(bot, session_pool)
+
 
-    active_jobs = scheduler.get_jobs()
-    logging.info(f"Планировщик перезапустился с {len(active_jobs)} джобами для текущей фазы.")
+def stop_scheduler_on_demotion():
+    """Останавливает планировщик при потере роли ведущего. При новом избрании джобы создаются заново."""
+    scheduler.remove_all_jobs()
+    _job_signatures.clear()
+    shutdown_scheduler()
 
 
 def start_scheduler():
@@ -262,3 +526,12 @@ def start_scheduler():
     if not scheduler.running:
         scheduler.start()
         logging.info("Планировщик запущен.")
+
+
+def shutdown_scheduler():
+    global scheduler
+
+    if scheduler.running:
+        # Не ждем завершения джобов: они работают в том же event loop, что и бот
+        scheduler.shutdown(wait=False)
+        logging.info("Планировщик остановлен.")
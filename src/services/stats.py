@@ -2,8 +2,9 @@ import datetime as dt
 from collections import defaultdict
 from decimal import Decimal
 
-import pytz
+from pytz import BaseTzInfo
 
+from src.core.report_cache import report_cache
 from src.core.settings import settings
 from src.db.models.user import User
 from src.db.repo_holder import RepoHolder
@@ -24,48 +25,38 @@ RU_MONTHS = [
 ]
 
 
-def _get_date_range(user_timezone: str) -> tuple[dt.date, dt.datetime]:
-    """Возвращает начало и конец текущего месяца в таймзоне пользователя."""
-    timezone = pytz.timezone(user_timezone)
-    today = dt.datetime.now(tz=timezone).date()
-    start_of_month = today.replace(day=1)
-    end_of_today = dt.datetime.combine(today, dt.time.max)
-    return start_of_month, end_of_today
+def get_current_month(user_timezone: BaseTzInfo) -> dt.date:
+    """Возвращает первое число текущего месяца в таймзоне пользователя."""
+    return dt.datetime.now(tz=user_timezone).date().replace(day=1)
 
 
-async def _calculate_user_specific_balance(repo: RepoHolder, user: User, start_date: dt.date, end_date: dt.datetime) -> dict | None:
+def shift_month(month: dt.date, delta: int) -> dt.date:
+    """Сдвигает первое число месяца на delta месяцев вперед или назад."""
+    month_index = month.year * 12 + month.month - 1 + delta
+    return dt.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+async def _calculate_user_specific_balance(repo: RepoHolder, user: User, month: dt.date) -> dict | None:
     """Рассчитывает остаток, новые доходы и текущий баланс для доходного конверта пользователя."""
     income_envelope = await repo.envelope.get_by_owner_id(user.id)
 
     if not income_envelope:
         return None
 
-    # 1. Считаем все поступления (доходы/переводы) в доходный конверт за текущий месяц
-    income_transactions_this_month = await repo.transaction.get_income_for_envelope_and_period(
-        income_envelope.id, start_date, end_date
-    )
-    transfers_to_income_this_month = await repo.transfer.get_to_envelope_for_period(
-        income_envelope.id, start_date, end_date
-    )
-    total_income_this_month = (
-        sum(t.amount for t in income_transactions_this_month)
-        + sum(t.amount for t in transfers_to_income_this_month)
-    )
+    flows = await repo.monthly_rollup.get_envelope_flows_for_month(income_envelope.id, month)
 
-    # 2. Считаем все расходы (расходы/переводы) из доходного конверта за текущий месяц
-    expense_transactions_this_month = await repo.transaction.get_expense_for_envelope_and_period(
-        income_envelope.id, start_date, end_date
-    )
-    transfers_from_income_this_month = await repo.transfer.get_from_envelope_for_period(
-        income_envelope.id, start_date, end_date
-    )
-    total_expense_this_month = (
-        sum(t.amount for t in expense_transactions_this_month)
-        + sum(t.amount for t in transfers_from_income_this_month)
-    )
+    # 1. Все поступления (доходы/переводы) в доходный конверт за месяц
+    total_income_this_month = flows["income"] + flows["transfers_in"]
 
-    # 3. Вычисляем баланс на начало месяца (Остаток с прошлого месяца)
-    balance_at_start_of_month = income_envelope.balance - (total_income_this_month - total_expense_this_month)
+    # 2. Все расходы (расходы/переводы) из доходного конверта за месяц
+    total_expense_this_month = flows["expense"] + flows["transfers_out"]
+
+    # 3. Восстанавливаем баланс на конец месяца, откатывая движение за последующие месяцы
+    net_after_month = await repo.monthly_rollup.get_envelope_net_after_month(income_envelope.id, month)
+    balance_at_end_of_month = income_envelope.balance - net_after_month
+
+    # 4. Вычисляем баланс на начало месяца (Остаток с прошлого месяца)
+    balance_at_start_of_month = balance_at_end_of_month - (total_income_this_month - total_expense_this_month)
 
     # Общий доступный фонд = Остаток с прошлого месяца + Доходы за текущий месяц
     total_available = balance_at_start_of_month + total_income_this_month
@@ -75,35 +66,28 @@ async def _calculate_user_specific_balance(repo: RepoHolder, user: User, start_d
         "total_income_this_month": total_income_this_month,
         "total_expense_this_month": total_expense_this_month,
         "total_available": total_available,
-        "current_balance": income_envelope.balance,
+        "current_balance": balance_at_end_of_month,
         "envelope_name": income_envelope.name
     }
 
 
-async def _calculate_total_stats(repo: RepoHolder, start_date: dt.date, end_date: dt.datetime) -> dict:
+async def _calculate_total_stats(repo: RepoHolder, month: dt.date) -> dict:
     """
     Рассчитывает общую статистику по всем пользователям.
     """
-    user_ids = settings.allowed_telegram_ids
-    users = [await repo.user.get_by_telegram_id(uid) for uid in user_ids]
-
-    all_transactions = await repo.transaction.get_all_for_period(start_date, end_date)
+    users = await repo.user.get_by_telegram_ids(settings.allowed_telegram_ids)
+    totals_by_user = await repo.monthly_rollup.get_totals_by_user_for_month(month)
 
     total_income = Decimal(0)
     total_expense = Decimal(0)
     expenses_by_user = defaultdict(Decimal)
 
-    # Суммируем доходы/расходы из transactions
-    for t in all_transactions:
-        category = await repo.category.get_by_id(t.category_id)
-        if category.type == "income":
-            total_income += t.amount
-        else:
-            total_expense += t.amount
-            expenses_by_user[t.user_id] += t.amount
+    for row in totals_by_user:
+        total_income += row.income
+        total_expense += row.expense
+        expenses_by_user[row.user_id] += row.expense
 
-    savings_transfers = await repo.transfer.get_all_savings_for_period(start_date, end_date)
-    total_savings = sum(t.amount for t in savings_transfers)
+    total_savings = await repo.monthly_rollup.get_savings_total_for_month(month)
 
     return {
         "total_income": total_income,
@@ -114,16 +98,29 @@ async def _calculate_total_stats(repo: RepoHolder, start_date: dt.date, end_date
     }
 
 
-async def prepare_current_month_report(repo: RepoHolder, user: User) -> str:
+async def prepare_current_month_report(repo: RepoHolder, user: User, user_timezone: BaseTzInfo) -> str:
     """Готовит расширенный текстовый отчет за текущий месяц."""
-    start_of_month, end_of_today = _get_date_range(user.timezone)
-    today = dt.datetime.now(tz=pytz.timezone(user.timezone)).date()
-    user_balance_data = await _calculate_user_specific_balance(repo, user, start_of_month, end_of_today)
-    total_stats = await _calculate_total_stats(repo, start_of_month, end_of_today)
+    return await prepare_month_report(repo, user, get_current_month(user_timezone), user_timezone)
+
+
+async def prepare_month_report(repo: RepoHolder, user: User, month: dt.date, user_timezone: BaseTzInfo) -> str:
+    """Готовит расширенный текстовый отчет за любой месяц (с кэшированием)."""
+    return await report_cache.get_or_build(
+        "stats", user.id, month, lambda: _build_month_report(repo, user, month, user_timezone)
+    )
+
+
+async def _build_month_report(repo: RepoHolder, user: User, start_of_month: dt.date, user_timezone: BaseTzInfo) -> str:
+    """Собирает текст отчета за месяц."""
+    # Агрегаты берем из monthly_rollups: стоимость отчета не зависит от числа транзакций
+    user_balance_data = await _calculate_user_specific_balance(repo, user, start_of_month)
+    total_stats = await _calculate_total_stats(repo, start_of_month)
 
     month_name = RU_MONTHS[start_of_month.month - 1]
+    is_current_month = start_of_month == get_current_month(user_timezone)
+    balance_label = "Текущий остаток на вашем конверте" if is_current_month else "Остаток на конец месяца"
 
-    report_title = f"Отчет за {month_name} {today.year}"
+    report_title = f"Отчет за {month_name} {start_of_month.year}"
     report_lines = [
         f"📊 **{report_title}**\n",
         f"---",
@@ -136,7 +133,7 @@ async def prepare_current_month_report(repo: RepoHolder, user: User) -> str:
             f"🗂️ **Остаток с прошлого месяца:** `{user_balance_data['balance_at_start_of_month']:.2f} ₽`",
             f"💵 **Всего доступно:** `{user_balance_data['total_available']:.2f} ₽`",
             f"📈 **Расходы за месяц:** `{user_balance_data['total_expense_this_month']:.2f} ₽`",
-            f"✅ **Текущий остаток на вашем конверте:** `{user_balance_data['current_balance']:.2f} ₽`\n",
+            f"✅ **{balance_label}:** `{user_balance_data['current_balance']:.2f} ₽`\n",
         ])
     else:
         report_lines.append("❌ Ошибка: доходный конверт для вас не найден.\n")
@@ -157,3 +154,33 @@ async def prepare_current_month_report(repo: RepoHolder, user: User) -> str:
 
 
     return "\n".join(report_lines)
+
+
+async def prepare_year_report(repo: RepoHolder, user: User, year: int) -> str:
+    """Готовит сводку по месяцам за год (с кэшированием)."""
+    return await report_cache.get_or_build("year", user.id, year, lambda: _build_year_report(repo, year))
+
+
+async def _build_year_report(repo: RepoHolder, year: int) -> str:
+    """Собирает помесячную сводку за год из monthly_rollups."""
+    monthly_totals = await repo.monthly_rollup.get_monthly_totals_for_year(year)
+
+    if not monthly_totals:
+        return f"📅 **Итоги {year} года**\n\nЗа этот год операций нет."
+
+    report_lines = [f"📅 **Итоги {year} года**\n"]
+
+    for row in monthly_totals:
+        report_lines.append(
+            f"**{RU_MONTHS[row.month.month - 1]}:** "
+            f"💰 `{row.income:.2f} ₽` · 📈 `{row.expense:.2f} ₽` · 🎯 `{row.savings:.2f} ₽`"
+        )
+
+    report_lines.extend([
+        "\n---",
+        f"💰 Доход за год: `{sum(row.income for row in monthly_totals):.2f} ₽`",
+        f"📈 Расходы за год: `{sum(row.expense for row in monthly_totals):.2f} ₽`",
+        f"🎯 Отложено за год: `{sum(row.savings for row in monthly_totals):.2f} ₽`",
+    ])
+
+    return "\n".join(report_lines)
@@ -0,0 +1,117 @@
+import calendar
+import datetime as dt
+
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.util import astimezone, localize
+
+from src.services.workdays import workday_calendar
+
+# Дни, которые переносятся НАЗАД на последний рабочий день
+DAYS_TO_MOVE_BACK = {5, 20}
+# Дни, которые переносятся ВПЕРЁД на первый рабочий день
+DAYS_TO_MOVE_FORWARD = {10, 25}
+
+
+def get_corrected_date(year: int, month: int, day_of_month: int) -> dt.date:
+    """
+    Возвращает дату запуска задачи в указанном месяце. Если дня нет в месяце, берется
+    последний день; выходные и праздники для дней из DAYS_TO_MOVE_* переносятся.
+    """
+    last_day_of_month = calendar.monthrange(year, month)[1]
+    target_date = dt.date(year, month, min(day_of_month, last_day_of_month))
+
+    if day_of_month in DAYS_TO_MOVE_BACK:
+        return workday_calendar.prev_workday(target_date)
+
+    if day_of_month in DAYS_TO_MOVE_FORWARD:
+        return workday_calendar.next_workday(target_date)
+
+    return target_date
+
+
+def get_corrected_dates(day_of_month: int, start_year: int, years: int) -> list[dt.date]:
+    """Даты запуска задачи на все месяцы years лет начиная со start_year (пакетный расчет)."""
+    target_dates = [
+        dt.date(year, month, min(day_of_month, calendar.monthrange(year, month)[1]))
+        for year in range(start_year, start_year + years)
+        for month in range(1, 13)
+    ]
+
+    if day_of_month in DAYS_TO_MOVE_BACK:
+        return workday_calendar.shift_to_workdays(target_dates, move_forward=False)
+
+    if day_of_month in DAYS_TO_MOVE_FORWARD:
+        return workday_calendar.shift_to_workdays(target_dates, move_forward=True)
+
+    return target_dates
+
+
+def shift_month(year: int, month: int, delta: int) -> tuple[int, int]:
+    """Сдвигает (год, месяц) на delta месяцев."""
+    month_index = year * 12 + month - 1 + delta
+    return month_index // 12, month_index % 12 + 1
+
+
+class BusinessDayTrigger(BaseTrigger):
+    """
+    Ежемесячный триггер на заданный день и час с переносом на рабочий день.
+    Перенос считается для каждого месяца в момент расчета следующего запуска,
+    поэтому перезагружать джобы в начале месяца не нужно.
+    """
+
+    __slots__ = "day", "hour", "timezone"
+
+    # Перенос не уводит запуск дальше соседнего месяца, поэтому проверяем и его
+    _MONTHS_AROUND = 1
+
+    def __init__(self, day: int, hour: int, timezone) -> None:
+        self.day = day
+        self.hour = hour
+        self.timezone = astimezone(timezone)
+
+    def get_fire_time_for_month(self, year: int, month: int) -> dt.datetime:
+        """Время запуска, относящегося к указанному месяцу (с учетом переноса)."""
+        fire_date = get_corrected_date(year, month, self.day)
+        return localize(dt.datetime.combine(fire_date, dt.time(self.hour)), self.timezone)
+
+    def get_next_fire_time(self, previous_fire_time: dt.datetime | None, now: dt.datetime) -> dt.datetime | None:
+        start = previous_fire_time + dt.timedelta(microseconds=1) if previous_fire_time else now
+        start = start.astimezone(self.timezone)
+
+        # Запуски идут по месяцам монотонно: первый не раньше start и есть следующий
+        for offset in range(-self._MONTHS_AROUND, 13):
+            fire_time = self.get_fire_time_for_month(*shift_month(start.year, start.month, offset))
+
+            if fire_time >= start:
+                return fire_time
+
+        return None
+
+    def get_previous_fire_time(self, now: dt.datetime) -> dt.datetime | None:
+        """Последний запуск не позже now."""
+        now = now.astimezone(self.timezone)
+
+        for offset in range(self._MONTHS_AROUND, -13, -1):
+            fire_time = self.get_fire_time_for_month(*shift_month(now.year, now.month, offset))
+
+            if fire_time <= now:
+                return fire_time
+
+        return None
+
+    def get_next_fire_times(self, count: int, now: dt.datetime) -> list[dt.datetime]:
+        """Ближайшие count запусков начиная с now (для предпросмотра расписания)."""
+        fire_times = []
+        fire_time = self.get_next_fire_time(None, now)
+
+        while fire_time is not None and len(fire_times) < count:
+            fire_times.append(fire_time)
+            fire_time = self.get_next_fire_time(fire_time, now)
+
+        return fire_times
+
+    def __str__(self) -> str:
+        return f"business_day[day={self.day}, hour={self.hour}]"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} (day={self.day}, hour={self.hour}, timezone='{self.timezone}')>"
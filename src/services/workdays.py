@@ -0,0 +1,101 @@
+import datetime as dt
+from array import array
+from typing import Iterable
+
+# Признак отсутствия рабочего дня до конца/от начала года в таблицах сдвига
+_NO_WORKDAY = -1
+
+
+class _YearTable:
+    """
+    Рабочие дни одного года. Для каждого дня года хранится флаг «рабочий» и порядковые
+    номера (date.toordinal) ближайшего рабочего дня не раньше и не позже него.
+    """
+
+    __slots__ = "first_ordinal", "workdays", "next_ordinals", "prev_ordinals"
+
+    def __init__(self, year: int, holidays: set[dt.date]) -> None:
+        self.first_ordinal = dt.date(year, 1, 1).toordinal()
+        days_in_year = dt.date(year + 1, 1, 1).toordinal() - self.first_ordinal
+
+        self.workdays = bytearray(days_in_year)
+        for index in range(days_in_year):
+            date_obj = dt.date.fromordinal(self.first_ordinal + index)
+            self.workdays[index] = date_obj.weekday() < 5 and date_obj not in holidays
+
+        self.next_ordinals = array("l", [_NO_WORKDAY]) * days_in_year
+        nearest = _NO_WORKDAY
+        for index in range(days_in_year - 1, -1, -1):
+            if self.workdays[index]:
+                nearest = self.first_ordinal + index
+            self.next_ordinals[index] = nearest
+
+        self.prev_ordinals = array("l", [_NO_WORKDAY]) * days_in_year
+        nearest = _NO_WORKDAY
+        for index in range(days_in_year):
+            if self.workdays[index]:
+                nearest = self.first_ordinal + index
+            self.prev_ordinals[index] = nearest
+
+
+class WorkdayCalendar:
+    """
+    Производственный календарь с предрасчетом по годам. Год строится один раз при первом
+    обращении (тогда же лениво импортируется workalendar), дальше все проверки — O(1).
+    Рабочий день — будний день, не являющийся официальным праздником.
+    """
+
+    def __init__(self) -> None:
+        self._years: dict[int, _YearTable] = {}
+        self._national_calendar = None
+
+    def _get_year(self, year: int) -> _YearTable:
+        table = self._years.get(year)
+
+        if table is None:
+            if self._national_calendar is None:
+                from workalendar.europe import Russia
+
+                self._national_calendar = Russia()
+
+            holidays = {holiday for holiday, _ in self._national_calendar.holidays(year)}
+            table = self._years[year] = _YearTable(year, holidays)
+
+        return table
+
+    def is_workday(self, date_obj: dt.date) -> bool:
+        """Проверяет, является ли дата рабочим днем."""
+        table = self._get_year(date_obj.year)
+        return bool(table.workdays[date_obj.toordinal() - table.first_ordinal])
+
+    def next_workday(self, date_obj: dt.date) -> dt.date:
+        """Ближайший рабочий день не раньше даты."""
+        table = self._get_year(date_obj.year)
+        ordinal = table.next_ordinals[date_obj.toordinal() - table.first_ordinal]
+
+        if ordinal == _NO_WORKDAY:
+            return self.next_workday(dt.date(date_obj.year + 1, 1, 1))
+
+        return dt.date.fromordinal(ordinal)
+
+    def prev_workday(self, date_obj: dt.date) -> dt.date:
+        """Ближайший рабочий день не позже даты."""
+        table = self._get_year(date_obj.year)
+        ordinal = table.prev_ordinals[date_obj.toordinal() - table.first_ordinal]
+
+        if ordinal == _NO_WORKDAY:
+            return self.prev_workday(dt.date(date_obj.year - 1, 12, 31))
+
+        return dt.date.fromordinal(ordinal)
+
+    def shift_to_workdays(self, dates: Iterable[dt.date], move_forward: bool) -> list[dt.date]:
+        """Переносит каждую дату на ближайший рабочий день вперед или назад (пакетно)."""
+        shift = self.next_workday if move_forward else self.prev_workday
+        return [shift(date_obj) for date_obj in dates]
+
+    def clear(self) -> None:
+        """Сбрасывает предрасчитанные годы (например, после обновления workalendar)."""
+        self._years.clear()
+
+
+workday_calendar = WorkdayCalendar()
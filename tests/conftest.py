@@ -0,0 +1,37 @@
+import os
+
+# Настройки читаются при импорте src; для тестов хватает заглушек, БД — SQLite в памяти
+for name, value in {
+    "BOT_TOKEN": "42:TEST",
+    "ALLOWED_TELEGRAM_IDS": "[111, 222]",
+    "USER_1_TELEGRAM_ID": "111",
+    "USER_1_USERNAME": "user_1",
+    "USER_2_TELEGRAM_ID": "222",
+    "USER_2_USERNAME": "user_2",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_DB": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine  # noqa: E402
+
+from src.db.models import Base  # noqa: E402
+
+
+@pytest.fixture
+async def engine() -> AsyncEngine:
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_pool(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
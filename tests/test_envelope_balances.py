@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+import pytest
+
+from src.core.report_cache import report_cache
+from src.db.models import Envelope
+from src.db.repo_holder import RepoHolder
+from src.db.unit_of_work import unit_of_work
+
+
+async def seed_envelopes(session_pool) -> tuple[int, int]:
+    """Два конверта: со 100 ₽ и пустой."""
+    async with session_pool() as session:
+        source = Envelope(name="Доходы", balance=Decimal(100), is_active=True, is_savings=False)
+        target = Envelope(name="Подушка", balance=Decimal(0), is_active=True, is_savings=True)
+        session.add_all([source, target])
+        await session.commit()
+
+        return source.id, target.id
+
+
+async def get_balances(session_pool, *envelope_ids: int) -> list[Decimal]:
+    async with session_pool() as session:
+        return [(await session.get(Envelope, envelope_id)).balance for envelope_id in envelope_ids]
+
+
+async def test_move_balance_commits_without_unit_of_work(session_pool):
+    source_id, target_id = await seed_envelopes(session_pool)
+    version = report_cache.get_version("envelopes")
+
+    async with session_pool() as session:
+        assert await RepoHolder(session).envelope.move_balance(source_id, target_id, Decimal(30)) is not None
+        # Коммит сделан в самом методе, после него инвалидирован и кэш отчетов
+        assert report_cache.get_version("envelopes") != version
+
+    assert await get_balances(session_pool, source_id, target_id) == [Decimal(70), Decimal(30)]
+
+
+async def test_move_balance_in_unit_of_work_bumps_cache_on_commit(session_pool):
+    source_id, target_id = await seed_envelopes(session_pool)
+    version = report_cache.get_version("envelopes")
+
+    async with session_pool() as session, unit_of_work(session):
+        await RepoHolder(session).envelope.move_balance(source_id, target_id, Decimal(30))
+        assert report_cache.get_version("envelopes") == version
+
+    assert report_cache.get_version("envelopes") != version
+    assert await get_balances(session_pool, source_id, target_id) == [Decimal(70), Decimal(30)]
+
+
+@pytest.mark.parametrize("in_unit_of_work", [False, True])
+async def test_move_balance_rejects_overdraft(session_pool, in_unit_of_work):
+    source_id, target_id = await seed_envelopes(session_pool)
+
+    async with session_pool() as session:
+        repo = RepoHolder(session)
+
+        if in_unit_of_work:
+            async with unit_of_work(session):
+                assert await repo.envelope.move_balance(source_id, target_id, Decimal(150)) is None
+        else:
+            assert await repo.envelope.move_balance(source_id, target_id, Decimal(150)) is None
+
+    assert await get_balances(session_pool, source_id, target_id) == [Decimal(100), Decimal(0)]
+
+
+async def test_move_balance_rejects_same_envelope(session_pool):
+    source_id, _ = await seed_envelopes(session_pool)
+
+    async with session_pool() as session:
+        with pytest.raises(ValueError):
+            await RepoHolder(session).envelope.move_balance(source_id, source_id, Decimal(30))
+
+    assert await get_balances(session_pool, source_id) == [Decimal(100)]
@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+import pytest
+
+from src.services.income_split import calculate_income_shares
+
+
+def test_shares_are_rounded_down_to_kopeck():
+    shares = calculate_income_shares(Decimal("1000.33"), [(2, Decimal(30)), (3, Decimal("10.5"))])
+
+    # 300.099 и 105.03465 ₽
+    assert shares == [(2, Decimal("300.09")), (3, Decimal("105.03"))]
+
+
+def test_shares_are_capped_by_remaining_income():
+    shares = calculate_income_shares(Decimal(100), [(2, Decimal(60)), (3, Decimal(60)), (4, Decimal(10))])
+
+    assert shares == [(2, Decimal(60)), (3, Decimal(40))]
+
+
+def test_zero_shares_are_dropped():
+    assert calculate_income_shares(Decimal("0.05"), [(2, Decimal(10)), (3, Decimal(0))]) == []
+
+
+@pytest.mark.parametrize("income", [Decimal("0.01"), Decimal("0.99"), Decimal("1234.56"), Decimal("99999.99")])
+def test_shares_never_exceed_income(income):
+    percents = [(2, Decimal("33.33")), (3, Decimal("33.33")), (4, Decimal("33.34"))]
+    shares = calculate_income_shares(income, percents)
+
+    assert sum(share for _, share in shares) <= income
+    assert all(share == share.quantize(Decimal("0.01")) for _, share in shares)
@@ -0,0 +1,69 @@
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from src.db.models import NotificationOutbox
+from src.db.repositories.notification_outbox import STATUS_PENDING, STATUS_SENT
+from src.services.notifications import NotificationDispatcher
+
+
+class RecordingBot:
+    """Бот, который запоминает отправленные сообщения и «отправляет» их не сразу."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[int, str]] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> None:
+        await asyncio.sleep(0.05)
+        self.sent.append((chat_id, text))
+
+
+async def seed_notification(session_pool) -> NotificationOutbox:
+    async with session_pool() as session:
+        notification = NotificationOutbox(chat_id=111, text="Авто-перевод выполнен", status=STATUS_PENDING)
+        session.add(notification)
+        await session.commit()
+
+        return notification
+
+
+def make_dispatcher(session_pool) -> NotificationDispatcher:
+    dispatcher = NotificationDispatcher(global_rate=100, per_chat_rate=100, max_attempts=3)
+    dispatcher.setup(session_pool)
+    return dispatcher
+
+
+async def test_dispatch_skips_notifications_already_in_flight(session_pool):
+    notification = await seed_notification(session_pool)
+    dispatcher = make_dispatcher(session_pool)
+    bot = RecordingBot()
+
+    # Повторная выборка pending (например, resume_pending после перевыборов), пока первая отправка не закончилась
+    dispatcher.dispatch(bot, [notification])
+    dispatcher.dispatch(bot, [notification])
+    await asyncio.gather(*dispatcher._tasks.values())
+
+    assert bot.sent == [(111, "Авто-перевод выполнен")]
+    assert not dispatcher._tasks
+
+    async with session_pool() as session:
+        assert (await session.get(NotificationOutbox, notification.id)).status == STATUS_SENT
+
+
+async def test_failed_status_write_is_logged(session_pool, engine, caplog):
+    notification = await seed_notification(session_pool)
+    dispatcher = make_dispatcher(session_pool)
+    bot = RecordingBot()
+
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP TABLE notification_outbox")
+
+    dispatcher.dispatch(bot, [notification])
+    task = dispatcher._tasks[notification.id]
+    await task
+
+    assert bot.sent == [(111, "Авто-перевод выполнен")]
+    assert task.exception() is None
+    assert any(
+        isinstance(record.exc_info[1], OperationalError) for record in caplog.records if record.exc_info
+    )
@@ -0,0 +1,121 @@
+import datetime as dt
+from collections import defaultdict
+from decimal import Decimal
+
+import pytz
+from sqlalchemy import event
+
+from src.db.models import Category, Envelope, MonthlyRollup, Transaction, Transfer, User
+from src.db.repo_holder import RepoHolder
+from src.db.repositories.monthly_rollup import TRANSFER_IN, TRANSFER_OUT
+from src.services.stats import prepare_month_report
+
+TRANSACTIONS_COUNT = 30
+
+
+async def seed_accounts(session_pool) -> User:
+    """Создает пользователей, категории и конверты; возвращает владельца доходного конверта."""
+    async with session_pool() as session:
+        user = User(telegram_id=111, username="user_1", timezone="Europe/Moscow")
+        other_user = User(telegram_id=222, username="user_2", timezone="Europe/Moscow")
+        income = Category(name="Зарплата", type="income", is_active=True)
+        expense = Category(name="Продукты", type="expense", is_active=True)
+        session.add_all([user, other_user, income, expense])
+        await session.flush()
+
+        session.add_all(
+            [
+                Envelope(name="Доходы", balance=Decimal(0), owner_id=user.id, is_active=True, is_savings=False),
+                Envelope(name="Подушка", balance=Decimal(0), is_active=True, is_savings=True),
+            ]
+        )
+        await session.commit()
+
+        return user
+
+
+async def seed_month(session_pool, month: dt.date, transactions_count: int) -> None:
+    """
+    Записывает транзакции за месяц вместе с их агрегатами в monthly_rollups.
+    Агрегаты считаются здесь же: upsert из MonthlyRollupRepository работает только в Postgres.
+    """
+    async with session_pool() as session:
+        repo = RepoHolder(session)
+        users = await repo.user.get_by_telegram_ids([111, 222])
+        categories = {category.type: category for category in await repo.category.get_all()}
+        income_envelope = await repo.envelope.get_by_name("Доходы")
+        savings = await repo.envelope.get_by_name("Подушка")
+        rollups = defaultdict(lambda: [Decimal(0), 0])
+
+        for n in range(transactions_count):
+            category = categories["income" if n % 3 == 0 else "expense"]
+            transaction = Transaction(
+                user_id=users[n % 2].id,
+                category_id=category.id,
+                envelope_id=income_envelope.id,
+                amount=Decimal(10),
+                transaction_date=month + dt.timedelta(days=n % 28),
+            )
+            session.add(transaction)
+            rollup = rollups[(income_envelope.id, category.id, transaction.user_id, category.type)]
+            rollup[0] += transaction.amount
+            rollup[1] += 1
+
+        transfer = Transfer(
+            from_envelope_id=income_envelope.id,
+            to_envelope_id=savings.id,
+            amount=Decimal(5),
+            transfer_date=dt.datetime.combine(month, dt.time(12)),
+        )
+        session.add(transfer)
+        rollups[(income_envelope.id, None, None, TRANSFER_OUT)] = [transfer.amount, 1]
+        rollups[(savings.id, None, None, TRANSFER_IN)] = [transfer.amount, 1]
+
+        session.add_all(
+            MonthlyRollup(
+                month=month,
+                envelope_id=envelope_id,
+                category_id=category_id,
+                user_id=user_id,
+                direction=direction,
+                amount=amount,
+                operations_count=count,
+            )
+            for (envelope_id, category_id, user_id, direction), (amount, count) in rollups.items()
+        )
+        await session.commit()
+
+
+async def build_report(engine, session_pool, user: User, month: dt.date) -> tuple[int, str]:
+    """Строит отчет за месяц и возвращает число запросов к БД вместе с текстом отчета."""
+    queries = 0
+
+    def count_query(*args) -> None:
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+
+    try:
+        async with session_pool() as session:
+            report = await prepare_month_report(RepoHolder(session), user, month, pytz.timezone(user.timezone))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_query)
+
+    return queries, report
+
+
+async def test_month_report_query_count_does_not_depend_on_transactions(engine, session_pool):
+    user = await seed_accounts(session_pool)
+    small_month, large_month = dt.date(2026, 8, 1), dt.date(2026, 9, 1)
+    await seed_month(session_pool, small_month, TRANSACTIONS_COUNT)
+    await seed_month(session_pool, large_month, TRANSACTIONS_COUNT * 10)
+
+    small_queries, small_report = await build_report(engine, session_pool, user, small_month)
+    large_queries, large_report = await build_report(engine, session_pool, user, large_month)
+
+    assert small_queries > 0
+    assert small_queries == large_queries
+    # Отчеты действительно посчитаны по данным: в каждой тройке операций два расхода по 10 ₽
+    assert "Общие расходы: `200.00 ₽`" in small_report
+    assert "Общие расходы: `2000.00 ₽`" in large_report
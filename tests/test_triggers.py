@@ -0,0 +1,79 @@
+import datetime as dt
+
+import pytest
+import pytz
+
+from src.services.triggers import BusinessDayTrigger, get_corrected_date, get_corrected_dates
+
+MOSCOW = pytz.timezone("Europe/Moscow")
+
+
+def moscow(*args) -> dt.datetime:
+    return MOSCOW.localize(dt.datetime(*args))
+
+
+@pytest.mark.parametrize(
+    ("year", "month", "day", "expected"),
+    [
+        (2026, 2, 5, dt.date(2026, 2, 5)),  # рабочий день — без переноса
+        (2026, 1, 10, dt.date(2026, 1, 12)),  # суббота после праздников — вперед на понедельник
+        (2026, 5, 10, dt.date(2026, 5, 12)),  # воскресенье, за ним праздник 11 мая
+        (2026, 12, 5, dt.date(2026, 12, 4)),  # суббота — назад на пятницу
+        (2027, 1, 5, dt.date(2026, 12, 31)),  # новогодние праздники — назад в прошлый год
+        (2026, 2, 31, dt.date(2026, 2, 28)),  # дня нет в месяце — последний день
+    ],
+)
+def test_corrected_date(year, month, day, expected):
+    assert get_corrected_date(year, month, day) == expected
+
+
+@pytest.mark.parametrize("day", [1, 5, 10, 20, 25, 31])
+def test_corrected_dates_match_single_month_calculation(day):
+    expected = [get_corrected_date(year, month, day) for year in range(2025, 2028) for month in range(1, 13)]
+    assert get_corrected_dates(day, 2025, 3) == expected
+
+
+@pytest.mark.parametrize(
+    ("day", "now", "expected"),
+    [
+        (5, moscow(2026, 2, 1), moscow(2026, 2, 5, 10)),
+        (5, moscow(2026, 2, 5, 10), moscow(2026, 2, 5, 10)),  # время запуска включительно
+        (5, moscow(2026, 2, 5, 11), moscow(2026, 3, 5, 10)),
+        # Январский запуск перенесен на 31 декабря: следующий после Нового года — в феврале
+        (5, moscow(2026, 12, 20), moscow(2026, 12, 31, 10)),
+        (5, moscow(2027, 1, 1), moscow(2027, 2, 5, 10)),
+        (25, moscow(2026, 12, 26), moscow(2027, 1, 25, 10)),
+    ],
+)
+def test_next_fire_time(day, now, expected):
+    assert BusinessDayTrigger(day, 10, MOSCOW).get_next_fire_time(None, now) == expected
+
+
+def test_next_fire_time_after_previous_crosses_year():
+    trigger = BusinessDayTrigger(5, 10, MOSCOW)
+    previous = moscow(2026, 12, 31, 10)
+
+    assert trigger.get_next_fire_time(previous, previous) == moscow(2027, 2, 5, 10)
+
+
+@pytest.mark.parametrize(
+    ("now", "expected"),
+    [
+        (moscow(2026, 3, 10), moscow(2026, 3, 5, 10)),
+        (moscow(2026, 3, 5, 9), moscow(2026, 2, 5, 10)),
+        (moscow(2027, 1, 10), moscow(2026, 12, 31, 10)),
+        (moscow(2026, 12, 31, 12), moscow(2026, 12, 31, 10)),
+    ],
+)
+def test_previous_fire_time(now, expected):
+    assert BusinessDayTrigger(5, 10, MOSCOW).get_previous_fire_time(now) == expected
+
+
+def test_next_fire_times_cover_every_month_once():
+    trigger = BusinessDayTrigger(5, 10, MOSCOW)
+    fire_times = trigger.get_next_fire_times(12, moscow(2026, 2, 1))
+
+    # С февраля 2026 по январь 2027; январский запуск приходится на 31 декабря
+    assert fire_times == [trigger.get_fire_time_for_month(2026, month) for month in range(2, 13)] + [
+        moscow(2026, 12, 31, 10)
+    ]
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.bot.webhook import create_webhook_app
+
+WEBHOOK_PATH = "/telegram/webhook"
+SECRET_TOKEN = "test_webhook_secret"
+MAX_CONCURRENT_UPDATES = 2
+BUSY_CHAT_ID = 12345678
+BUSY_CHAT_UPDATES = 4  # очередь одного чата длиннее общего лимита
+OTHER_CHAT_IDS = [87654321, 11223344]
+HANDLER_DELAY = 0.2  # секунды: хендлер «долго» работает, а Telegram должен получить ответ сразу
+
+
+def make_update(update_id: int, chat_id: int) -> dict:
+    """Апдейт с текстовым сообщением в том виде, в каком его присылает Telegram."""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 1_700_000_000,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Test"},
+            "text": f"test {update_id}",
+        },
+    }
+
+
+def make_burst() -> list[dict]:
+    """Очередь апдейтов одного чата, за которой приходят апдейты других чатов."""
+    updates = [make_update(update_id, BUSY_CHAT_ID) for update_id in range(1, BUSY_CHAT_UPDATES + 1)]
+    updates += [make_update(BUSY_CHAT_UPDATES + i, chat_id) for i, chat_id in enumerate(OTHER_CHAT_IDS, start=1)]
+    return updates
+
+
+class Recorder:
+    """Хендлер, который «долго» работает и запоминает порядок и параллельность обработки."""
+
+    def __init__(self) -> None:
+        self.received: list[tuple[int, int]] = []  # (чат, номер апдейта) в порядке окончания обработки
+        self.running: dict[int, int] = {}
+        self.max_running = 0
+        self.max_running_per_chat = 0
+
+    async def on_message(self, message: Message) -> None:
+        chat_id = message.chat.id
+        self.running[chat_id] = self.running.get(chat_id, 0) + 1
+        self.max_running = max(self.max_running, sum(self.running.values()))
+        self.max_running_per_chat = max(self.max_running_per_chat, self.running[chat_id])
+        await asyncio.sleep(HANDLER_DELAY)
+        self.running[chat_id] -= 1
+        self.received.append((chat_id, message.message_id))
+
+    async def wait_for(self, count: int) -> None:
+        for _ in range(100):
+            if len(self.received) >= count:
+                return
+            await asyncio.sleep(0.05)
+
+
+@pytest.fixture
+def recorder() -> Recorder:
+    return Recorder()
+
+
+@pytest.fixture
+async def client(recorder: Recorder) -> TestClient:
+    bot = Bot(token="42:TEST_WEBHOOK")
+    dp = Dispatcher()
+    dp.message.register(recorder.on_message)
+    app = create_webhook_app(dp, bot, WEBHOOK_PATH, SECRET_TOKEN, MAX_CONCURRENT_UPDATES)
+
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+async def post_update(client: TestClient, update: dict, secret_token: str = SECRET_TOKEN) -> int:
+    response = await client.post(WEBHOOK_PATH, json=update, headers={"X-Telegram-Bot-Api-Secret-Token": secret_token})
+    return response.status
+
+
+async def test_rejects_wrong_secret(client, recorder):
+    assert await post_update(client, make_update(1, BUSY_CHAT_ID), secret_token="wrong") == 401
+
+    await asyncio.sleep(HANDLER_DELAY)
+    assert recorder.received == []
+
+
+async def test_answers_before_processing_and_limits_concurrency(client, recorder):
+    updates = make_burst()
+
+    started_at = asyncio.get_running_loop().time()
+    statuses = [await post_update(client, update) for update in updates]
+    answered_in = asyncio.get_running_loop().time() - started_at
+
+    assert statuses == [200] * len(updates)
+    assert answered_in < HANDLER_DELAY
+
+    await recorder.wait_for(len(updates))
+    assert len(recorder.received) == len(updates)
+    assert recorder.max_running == MAX_CONCURRENT_UPDATES
+
+
+async def test_chat_updates_are_serial_and_do_not_delay_other_chats(client, recorder):
+    updates = make_burst()
+
+    for update in updates:
+        await post_update(client, update)
+
+    await recorder.wait_for(len(updates))
+
+    busy_chat_order = [update_id for chat_id, update_id in recorder.received if chat_id == BUSY_CHAT_ID]
+    assert recorder.max_running_per_chat == 1
+    assert busy_chat_order == list(range(1, BUSY_CHAT_UPDATES + 1))
+    # Пока апдейты занятого чата ждут своей очереди, общий лимит достается другим чатам
+    assert recorder.received[-1][0] == BUSY_CHAT_ID
@@ -0,0 +1,83 @@
+import datetime as dt
+
+import pytest
+from workalendar.europe import Russia
+
+from src.services.workdays import WorkdayCalendar
+
+national_calendar = Russia()
+
+
+def old_is_workday(date_obj: dt.date) -> bool:
+    """Проверка рабочего дня в том виде, в каком она была до предрасчета календаря."""
+    return date_obj.weekday() < 5 and not national_calendar.is_holiday(date_obj)
+
+
+def old_find_nearest_workday(date_obj: dt.date, move_forward: bool) -> dt.date:
+    """Прежний поиск рабочего дня: шаг по одному дню с проверкой праздника."""
+    step = dt.timedelta(days=1 if move_forward else -1)
+
+    while not old_is_workday(date_obj):
+        date_obj += step
+
+    return date_obj
+
+
+@pytest.fixture
+def workdays() -> WorkdayCalendar:
+    return WorkdayCalendar()
+
+
+@pytest.mark.parametrize(
+    ("date_obj", "expected"),
+    [
+        (dt.date(2026, 1, 8), False),  # новогодние праздники
+        (dt.date(2026, 1, 12), True),
+        (dt.date(2026, 1, 10), False),  # суббота
+        (dt.date(2026, 5, 11), False),  # перенесенный выходной
+        (dt.date(2026, 12, 31), True),
+    ],
+)
+def test_is_workday(workdays, date_obj, expected):
+    assert workdays.is_workday(date_obj) is expected
+
+
+def test_shift_to_workday_spills_into_neighbouring_year(workdays):
+    # 31 декабря 2028 года — воскресенье, дальше новогодние праздники до 8 января
+    assert workdays.next_workday(dt.date(2028, 12, 31)) == dt.date(2029, 1, 9)
+    assert workdays.prev_workday(dt.date(2027, 1, 5)) == dt.date(2026, 12, 31)
+
+
+def test_shift_to_workdays_in_batch(workdays):
+    dates = [dt.date(2026, 1, 10), dt.date(2026, 2, 5), dt.date(2026, 5, 10)]
+
+    assert workdays.shift_to_workdays(dates, move_forward=True) == [
+        dt.date(2026, 1, 12),
+        dt.date(2026, 2, 5),
+        dt.date(2026, 5, 12),
+    ]
+    assert workdays.shift_to_workdays(dates, move_forward=False) == [
+        dt.date(2026, 1, 9),
+        dt.date(2026, 2, 5),
+        dt.date(2026, 5, 8),
+    ]
+
+
+def test_matches_day_by_day_logic_for_2024_2030(workdays):
+    date_obj = dt.date(2024, 1, 1)
+    mismatches = []
+
+    while date_obj.year <= 2030:
+        expected = (
+            old_is_workday(date_obj),
+            old_find_nearest_workday(date_obj, move_forward=True),
+            old_find_nearest_workday(date_obj, move_forward=False),
+        )
+        actual = (workdays.is_workday(date_obj), workdays.next_workday(date_obj), workdays.prev_workday(date_obj))
+
+        if actual != expected:
+            mismatches.append((date_obj, actual, expected))
+
+        date_obj += dt.timedelta(days=1)
+
+    assert mismatches == []